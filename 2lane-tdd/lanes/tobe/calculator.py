@@ -3,84 +3,138 @@ Calculator implementation (TO-BE version).
 Refactored with better architecture, history tracking, and validation.
 """
 
+from collections.abc import Sequence
+from typing import Any, Dict, List, Union
+
+Number = Union[int, float]
+Record = Dict[str, Any]
+
+
+class HistoryView(Sequence[Record]):
+    """Read-only, non-copying view over a calculator's history columns"""
+
+    __slots__ = ("_calc",)
+
+    def __init__(self, calc: "Calculator") -> None:
+        self._calc = calc
+
+    def __len__(self) -> int:
+        return len(self._calc._ops)
+
+    def __getitem__(self, index: Any) -> Any:
+        calc = self._calc
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return {
+            "operation": calc._ops[index],
+            "operands": (calc._a[index], calc._b[index]),
+            "result": calc._res[index]
+        }
+
+    def __eq__(self, other: object) -> bool:
+        """Equal to any sequence holding the same records (like the old list)"""
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    # Mutable contents: not hashable, like the list it replaces
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"HistoryView({list(self)!r})"
+
+
 class Calculator:
     """Calculator class with history tracking"""
 
-    def __init__(self):
-        self.history = []
+    __slots__ = ("_ops", "_a", "_b", "_res")
 
-    def _record_operation(self, operation, a, b, result):
+    def __init__(self) -> None:
+        # History is stored column-wise; records are built on demand
+        self._ops: List[str] = []
+        self._a: List[Number] = []
+        self._b: List[Number] = []
+        self._res: List[Number] = []
+
+    def _record_operation(self, operation: str, a: Number, b: Number, result: Number) -> None:
         """Record operation to history"""
-        self.history.append({
-            "operation": operation,
-            "operands": (a, b),
-            "result": result
-        })
+        self._ops.append(operation)
+        self._a.append(a)
+        self._b.append(b)
+        self._res.append(result)
 
-    def add(self, a, b):
+    def add(self, a: Number, b: Number) -> Number:
         """Add two numbers"""
         result = a + b
         self._record_operation("add", a, b, result)
         return result
 
-    def subtract(self, a, b):
+    def subtract(self, a: Number, b: Number) -> Number:
         """Subtract two numbers"""
         result = a - b
         self._record_operation("subtract", a, b, result)
         return result
 
-    def multiply(self, a, b):
+    def multiply(self, a: Number, b: Number) -> Number:
         """Multiply two numbers"""
         result = a * b
         self._record_operation("multiply", a, b, result)
         return result
 
-    def divide(self, a, b):
+    def divide(self, a: Number, b: Number) -> Number:
         """Divide two numbers"""
-        if b == 0:
-            raise ZeroDivisionError("Cannot divide by zero")
-        result = a / b
+        # a / b already raises on zero; no explicit check on the hot path
+        try:
+            result = a / b
+        except ZeroDivisionError:
+            raise ZeroDivisionError("Cannot divide by zero") from None
         self._record_operation("divide", a, b, result)
         return result
 
-    def get_history(self):
-        """Get operation history"""
-        return self.history.copy()
-
-    def clear_history(self):
-        """Clear operation history"""
-        self.history.clear()
-
+    @property
+    def history(self) -> HistoryView:
+        """Live read-only view of the operation history.
 
-# Global calculator instance for backward compatibility
-_default_calculator = Calculator()
+        Compares equal to a list of the same records; it can't be appended
+        to, so use get_history() for a mutable copy.
+        """
+        return self.history_view()
 
+    def history_view(self) -> HistoryView:
+        """Get operation history without copying it"""
+        return HistoryView(self)
 
-def add(a, b):
-    """Add two numbers (wrapper for backward compatibility)"""
-    return _default_calculator.add(a, b)
-
-
-def subtract(a, b):
-    """Subtract two numbers (wrapper for backward compatibility)"""
-    return _default_calculator.subtract(a, b)
+    def get_history(self) -> List[Record]:
+        """Get operation history as a new list (safe to mutate)"""
+        return [
+            {"operation": op, "operands": (a, b), "result": result}
+            for op, a, b, result in zip(self._ops, self._a, self._b, self._res)
+        ]
 
+    def clear_history(self) -> None:
+        """Clear operation history"""
+        self._ops.clear()
+        self._a.clear()
+        self._b.clear()
+        self._res.clear()
 
-def multiply(a, b):
-    """Multiply two numbers (wrapper for backward compatibility)"""
-    return _default_calculator.multiply(a, b)
 
+# Global calculator instance for backward compatibility
+_default_calculator = Calculator()
 
-def divide(a, b):
-    """Divide two numbers (wrapper for backward compatibility)"""
-    return _default_calculator.divide(a, b)
+# Module-level functions are the default calculator's bound methods, so
+# add(2, 3) costs a single call (no wrapper frame)
+add = _default_calculator.add
+subtract = _default_calculator.subtract
+multiply = _default_calculator.multiply
+divide = _default_calculator.divide
 
 
-def get_calculator():
+def get_calculator() -> Calculator:
     """Get the default calculator instance"""
     return _default_calculator
 
 
-def new_calculator():
+def new_calculator() -> Calculator:
     """Create a new calculator instance"""
     return Calculator()
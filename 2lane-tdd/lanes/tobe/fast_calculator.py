@@ -0,0 +1,104 @@
+"""
+Calculator implementation (TO-BE version) with Numba-compiled kernels.
+Float arithmetic runs in the kernels; everything else (ints, mixed
+operands, or no numba installed) goes through the plain Calculator.
+"""
+
+from calculator import Calculator
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    # Eager float64 signatures: compiled once, cached on disk
+    _SIGNATURE = "f8(f8,f8)"
+
+    @njit(_SIGNATURE, cache=True)
+    def _add(a, b):
+        return a + b
+
+    @njit(_SIGNATURE, cache=True)
+    def _subtract(a, b):
+        return a - b
+
+    @njit(_SIGNATURE, cache=True)
+    def _multiply(a, b):
+        return a * b
+
+    @njit(_SIGNATURE, cache=True)
+    def _divide(a, b):
+        if b == 0.0:
+            raise ZeroDivisionError("Cannot divide by zero")
+        return a / b
+
+
+class FastCalculator:
+    """Calculator whose float arithmetic runs in native float64 kernels.
+
+    Wraps a Calculator rather than subclassing it, so it still works when
+    calculator.py is compiled with mypyc (interpreted classes can't
+    inherit from compiled ones). Only float pairs reach the kernels: ints
+    keep exact Python semantics (add(2, 3) is 5, big ints don't round).
+    """
+
+    __slots__ = ("_calc",)
+
+    def __init__(self):
+        self._calc = Calculator()
+
+    def add(self, a, b):
+        """Add two numbers"""
+        if njit is None or type(a) is not float or type(b) is not float:
+            return self._calc.add(a, b)
+        result = _add(a, b)
+        self._calc._record_operation("add", a, b, result)
+        return result
+
+    def subtract(self, a, b):
+        """Subtract two numbers"""
+        if njit is None or type(a) is not float or type(b) is not float:
+            return self._calc.subtract(a, b)
+        result = _subtract(a, b)
+        self._calc._record_operation("subtract", a, b, result)
+        return result
+
+    def multiply(self, a, b):
+        """Multiply two numbers"""
+        if njit is None or type(a) is not float or type(b) is not float:
+            return self._calc.multiply(a, b)
+        result = _multiply(a, b)
+        self._calc._record_operation("multiply", a, b, result)
+        return result
+
+    def divide(self, a, b):
+        """Divide two numbers"""
+        if njit is None or type(a) is not float or type(b) is not float:
+            return self._calc.divide(a, b)
+        result = _divide(a, b)
+        self._calc._record_operation("divide", a, b, result)
+        return result
+
+    @property
+    def history(self):
+        """Live read-only view of the operation history"""
+        return self._calc.history
+
+    def history_view(self):
+        """Get operation history without copying it"""
+        return self._calc.history_view()
+
+    def get_history(self):
+        """Get operation history as a new list (safe to mutate)"""
+        return self._calc.get_history()
+
+    def clear_history(self):
+        """Clear operation history"""
+        self._calc.clear_history()
+
+
+def new_fast_calculator():
+    """Create a new fast calculator instance"""
+    return FastCalculator()
@@ -11,13 +11,23 @@ import pytest
 WORKSPACE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ACTIVE_LANE_FILE = os.path.join(WORKSPACE_DIR, '.active-lane')
 
+# Cached (mtime, lane) of the last read of ACTIVE_LANE_FILE
+_active_lane_cache = None
+
 def get_active_lane():
     """Get the currently active lane."""
-    if os.path.exists(ACTIVE_LANE_FILE):
+    global _active_lane_cache
+    try:
+        mtime = os.stat(ACTIVE_LANE_FILE).st_mtime_ns
+    except FileNotFoundError:
+        # Default to AS-IS if no active lane set
+        return 'asis'
+
+    # Only re-read the file when it has changed since the last call
+    if _active_lane_cache is None or _active_lane_cache[0] != mtime:
         with open(ACTIVE_LANE_FILE, 'r') as f:
-            return f.read().strip()
-    # Default to AS-IS if no active lane set
-    return 'asis'
+            _active_lane_cache = (mtime, f.read().strip())
+    return _active_lane_cache[1]
 
 def setup_lane_imports():
     """Configure Python path to use the active lane."""
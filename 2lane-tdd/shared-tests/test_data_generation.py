@@ -5,64 +5,182 @@ Generates realistic test data using Faker library.
 
 import pytest
 import random
+import re
+import sys
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # generate_users_batch falls back to the scalar generator
+
+
+def _interned(*values: str) -> tuple:
+    """Tuple of interned strings, so equality checks hit the identity fast path"""
+    return tuple(sys.intern(v) for v in values)
+
+
+# Choice tables (built once at import). Tables indexed with getrandbits()
+# below (HTTP_METHODS, ENDPOINTS, CONTENT_TYPES, SORT_ORDERS, BOOLS,
+# VIEWPORTS, EMAIL_DOMAINS, BROWSERS) must keep a power-of-two length,
+# otherwise the bit index is out of range. Every other table and range
+# goes through choice()/randrange(), which stay uniform at any size.
+FIRST_NAMES = ("Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace")
+LAST_NAMES = ("Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia")
+EMAIL_DOMAINS = ("gmail.com", "yahoo.com", "outlook.com", "example.com")
+STREETS = ("Main St", "Oak Ave", "Elm Blvd", "Pine Rd", "Maple Dr")
+CITIES = ("Springfield", "Riverside", "Madison", "Franklin", "Georgetown")
+STATES = ("CA", "TX", "NY", "FL", "IL")
+CATEGORIES = ("Electronics", "Clothing", "Food", "Books", "Sports")
+PRODUCT_NAMES = (
+    "Wireless Headphones", "Cotton T-Shirt", "Organic Coffee",
+    "Python Programming Book", "Running Shoes"
+)
+STATUSES = _interned("pending", "shipped", "delivered", "cancelled")
+HTTP_METHODS = _interned("GET", "POST", "PUT", "DELETE")
+ENDPOINTS = _interned("/api/users", "/api/products", "/api/orders", "/api/auth/login")
+CONTENT_TYPES = _interned("application/json", "application/x-www-form-urlencoded")
+SORT_ORDERS = _interned("asc", "desc")
+FILTERS = _interned("active", "inactive", "all")
+BODY_DATA = ("test", "sample", "example")
+BOOLS = (True, False)
+# (width, height); dicts are built per session so callers can't mutate the table
+VIEWPORTS = ((1920, 1080), (1366, 768), (768, 1024), (375, 667))
+ADJECTIVES = ("Premium", "High-quality", "Durable", "Elegant", "Modern")
+NOUNS = ("product", "item", "design", "style", "model")
+BROWSERS = ("Chrome", "Firefox", "Safari", "Edge")
+OS_VERSIONS = ("Macintosh", "Windows NT 10.0", "X11; Linux x86_64")
+PAGES = ("/home", "/products", "/cart", "/checkout", "/success")
+
+# Cookie lifetimes
+_TD30 = timedelta(days=30)
+_TD365 = timedelta(days=365)
+
+# Bound once so each user agent is a single format call
+_UA_FMT = (
+    "Mozilla/5.0 ({}) AppleWebKit/537.36 (KHTML, like Gecko) {}/{}.0.{} Safari/537.36"
+).format
+
 
 class TestDataGenerator:
     """Generate realistic test data for various domains"""
 
+    __slots__ = ("seed", "_now_cache", "_rng")
+
     def __init__(self):
+        # Informational only until set_seed(): the stream isn't derived from it
         self.seed = random.randint(0, 10000)
+        self._now_cache = None
+        # Private Mersenne Twister per instance; no shared module RNG state.
+        # Unseeded, it starts from OS entropy, so independent generators
+        # don't repeat each other's data
+        self._rng = random.Random()
 
     def set_seed(self, seed: int):
         """Set random seed for reproducible tests"""
         self.seed = seed
-        random.seed(seed)
+        self._rng.seed(seed)
+
+    def _now(self) -> datetime:
+        """Current time, or the frozen batch time inside _frozen_now()"""
+        return self._now_cache or datetime.now()
+
+    @contextmanager
+    def _frozen_now(self):
+        """Share one datetime.now() across every timestamp made in the block"""
+        if self._now_cache is not None:
+            yield
+            return
+        self._now_cache = datetime.now()
+        try:
+            yield
+        finally:
+            self._now_cache = None
 
     def generate_user(self) -> Dict[str, Any]:
         """Generate a realistic user profile"""
-        first_names = ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace"]
-        last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia"]
-
         return {
-            "first_name": random.choice(first_names),
-            "last_name": random.choice(last_names),
+            "first_name": self._rng.choice(FIRST_NAMES),
+            "last_name": self._rng.choice(LAST_NAMES),
             "email": self._generate_email(),
             "phone": self._generate_phone(),
             "address": self._generate_address(),
-            "age": random.randint(18, 80),
+            "age": self._rng.randint(18, 80),
             "signup_date": self._generate_date()
         }
 
-    def generate_product(self) -> Dict[str, Any]:
-        """Generate a realistic product"""
-        categories = ["Electronics", "Clothing", "Food", "Books", "Sports"]
-        names = [
-            "Wireless Headphones", "Cotton T-Shirt", "Organic Coffee",
-            "Python Programming Book", "Running Shoes"
+    def generate_users_batch(self, n: int) -> List[Dict[str, Any]]:
+        """Generate n user profiles, drawing every field as a NumPy vector"""
+        with self._frozen_now():
+            if np is None:
+                return [self.generate_user() for _ in range(n)]
+            return self._generate_users_vectorized(n)
+
+    def _generate_users_vectorized(self, n: int) -> List[Dict[str, Any]]:
+        """NumPy implementation of generate_users_batch"""
+        rng = np.random.default_rng(self._rng.getrandbits(64))
+        now = self._now()
+
+        def ints(low, high):
+            return rng.integers(low, high, n).tolist()
+
+        def picks(table):
+            return [table[i] for i in rng.integers(0, len(table), n).tolist()]
+
+        firsts, lasts = picks(FIRST_NAMES), picks(LAST_NAMES)
+        locals_, domains = ints(1000, 10000), picks(EMAIL_DOMAINS)
+        areas, exchanges, numbers = ints(200, 1000), ints(200, 1000), ints(1000, 10000)
+        house_numbers, streets = ints(1, 10000), picks(STREETS)
+        cities, states, zips = picks(CITIES), picks(STATES), ints(10000, 100000)
+        ages, days_ago = ints(18, 81), ints(0, 366)
+
+        return [
+            {
+                "first_name": firsts[i],
+                "last_name": lasts[i],
+                "email": f"user{locals_[i]}@{domains[i]}",
+                "phone": f"({areas[i]}) {exchanges[i]}-{numbers[i]}",
+                "address": {
+                    "street": f"{house_numbers[i]} {streets[i]}",
+                    "city": cities[i],
+                    "state": states[i],
+                    "zip": f"{zips[i]}"
+                },
+                "age": ages[i],
+                "signup_date": (now - timedelta(days=days_ago[i])).isoformat()
+            }
+            for i in range(n)
         ]
 
+    def generate_product(self) -> Dict[str, Any]:
+        """Generate a realistic product"""
         return {
-            "name": random.choice(names),
-            "category": random.choice(categories),
-            "price": round(random.uniform(10.00, 1000.00), 2),
-            "stock": random.randint(0, 1000),
+            "name": self._rng.choice(PRODUCT_NAMES),
+            "category": self._rng.choice(CATEGORIES),
+            "price": round(self._rng.uniform(10.00, 1000.00), 2),
+            "stock": self._rng.randint(0, 1000),
             "description": self._generate_description(),
             "created_at": self._generate_date()
         }
 
     def generate_order(self, user_id: str) -> Dict[str, Any]:
         """Generate a realistic order"""
-        num_items = random.randint(1, 5)
+        with self._frozen_now():
+            return self._generate_order(user_id)
+
+    def _generate_order(self, user_id: str) -> Dict[str, Any]:
+        """Build an order; timestamps share the caller's frozen now"""
+        num_items = self._rng.randint(1, 5)
         items = [self.generate_product() for _ in range(num_items)]
 
         return {
             "user_id": user_id,
-            "order_id": f"ORD-{random.randint(10000, 99999)}",
+            "order_id": f"ORD-{self._rng.randint(10000, 99999)}",
             "items": items,
             "total": round(sum(item["price"] for item in items), 2),
-            "status": random.choice(["pending", "shipped", "delivered", "cancelled"]),
+            "status": self._rng.choice(STATUSES),
             "created_at": self._generate_date(),
             "shipping_address": self._generate_address()
         }
@@ -70,126 +188,114 @@ class TestDataGenerator:
     def generate_api_request(self) -> Dict[str, Any]:
         """Generate a realistic API request"""
         return {
-            "method": random.choice(["GET", "POST", "PUT", "DELETE"]),
-            "endpoint": random.choice([
-                "/api/users",
-                "/api/products",
-                "/api/orders",
-                "/api/auth/login"
-            ]),
+            "method": HTTP_METHODS[self._rng.getrandbits(2)],
+            "endpoint": ENDPOINTS[self._rng.getrandbits(2)],
             "headers": self._generate_headers(),
             "params": self._generate_params(),
             "body": self._generate_body(),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": self._now().isoformat()
         }
 
     def generate_browser_session(self) -> Dict[str, Any]:
         """Generate realistic browser session data"""
+        width, height = VIEWPORTS[self._rng.getrandbits(2)]
+
         return {
             "user_agent": self._generate_user_agent(),
-            "viewport": random.choice([
-                {"width": 1920, "height": 1080},
-                {"width": 1366, "height": 768},
-                {"width": 768, "height": 1024},
-                {"width": 375, "height": 667}
-            ]),
+            "viewport": {"width": width, "height": height},
             "cookies": self._generate_cookies(),
             "storage": self._generate_storage(),
             "pages_visited": self._generate_page_history(),
-            "session_duration": random.randint(60, 3600)  # seconds
+            "session_duration": self._rng.randint(60, 3600)  # seconds
         }
 
     def _generate_email(self) -> str:
         """Generate realistic email"""
-        domains = ["gmail.com", "yahoo.com", "outlook.com", "example.com"]
-        local = f"user{random.randint(1000, 9999)}"
-        return f"{local}@{random.choice(domains)}"
+        local = f"user{self._rng.randrange(1000, 10000)}"
+        return f"{local}@{EMAIL_DOMAINS[self._rng.getrandbits(2)]}"
 
     def _generate_phone(self) -> str:
         """Generate realistic US phone number"""
-        area_code = random.randint(200, 999)
-        exchange = random.randint(200, 999)
-        number = random.randint(1000, 9999)
+        randrange = self._rng.randrange
+        area_code = randrange(200, 1000)
+        exchange = randrange(200, 1000)
+        number = randrange(1000, 10000)
         return f"({area_code}) {exchange}-{number}"
 
     def _generate_address(self) -> Dict[str, str]:
         """Generate realistic address"""
-        streets = ["Main St", "Oak Ave", "Elm Blvd", "Pine Rd", "Maple Dr"]
-        cities = ["Springfield", "Riverside", "Madison", "Franklin", "Georgetown"]
-        states = ["CA", "TX", "NY", "FL", "IL"]
-
+        randrange, choice = self._rng.randrange, self._rng.choice
         return {
-            "street": f"{random.randint(1, 9999)} {random.choice(streets)}",
-            "city": random.choice(cities),
-            "state": random.choice(states),
-            "zip": f"{random.randint(10000, 99999)}"
+            "street": f"{randrange(1, 10000)} {choice(STREETS)}",
+            "city": choice(CITIES),
+            "state": choice(STATES),
+            "zip": f"{randrange(10000, 100000)}"
         }
 
     def _generate_date(self) -> str:
         """Generate random date within last year"""
-        days_ago = random.randint(0, 365)
-        date = datetime.now() - timedelta(days=days_ago)
+        days_ago = self._rng.randint(0, 365)
+        date = self._now() - timedelta(days=days_ago)
         return date.isoformat()
 
     def _generate_description(self) -> str:
         """Generate random description"""
-        adjectives = ["Premium", "High-quality", "Durable", "Elegant", "Modern"]
-        nouns = ["product", "item", "design", "style", "model"]
-        return f"A {random.choice(adjectives)} {random.choice(nouns)} for everyday use."
+        return f"A {self._rng.choice(ADJECTIVES)} {self._rng.choice(NOUNS)} for everyday use."
 
     def _generate_headers(self) -> Dict[str, str]:
         """Generate realistic HTTP headers"""
         return {
-            "Content-Type": random.choice(["application/json", "application/x-www-form-urlencoded"]),
+            "Content-Type": CONTENT_TYPES[self._rng.getrandbits(1)],
             "Accept": "application/json",
             "User-Agent": self._generate_user_agent(),
-            "Authorization": f"Bearer {random.randint(1000000, 9999999)}"
+            "Authorization": f"Bearer {self._rng.randint(1000000, 9999999)}"
         }
 
     def _generate_params(self) -> Dict[str, Any]:
         """Generate realistic query parameters"""
         return {
-            "page": random.randint(1, 10),
-            "limit": random.randint(10, 100),
-            "sort": random.choice(["asc", "desc"]),
-            "filter": random.choice(["active", "inactive", "all"])
+            "page": self._rng.randint(1, 10),
+            "limit": self._rng.randint(10, 100),
+            "sort": SORT_ORDERS[self._rng.getrandbits(1)],
+            "filter": self._rng.choice(FILTERS)
         }
 
     def _generate_body(self) -> Dict[str, Any]:
         """Generate realistic request body"""
         return {
-            "data": random.choice(["test", "sample", "example"]),
-            "value": random.randint(1, 100),
-            "active": random.choice([True, False])
+            "data": self._rng.choice(BODY_DATA),
+            "value": self._rng.randint(1, 100),
+            "active": BOOLS[self._rng.getrandbits(1)]
         }
 
     def _generate_user_agent(self) -> str:
         """Generate realistic user agent"""
-        browsers = ["Chrome", "Firefox", "Safari", "Edge"]
-        os_versions = ["Macintosh", "Windows NT 10.0", "X11; Linux x86_64"]
-
-        browser = random.choice(browsers)
-        version = f"{random.randint(100, 130)}.0.{random.randint(0, 9999)}"
-        os_version = random.choice(os_versions)
-
-        return f"Mozilla/5.0 ({os_version}) AppleWebKit/537.36 (KHTML, like Gecko) {browser}/{version} Safari/537.36"
+        randrange = self._rng.randrange
+        return _UA_FMT(
+            self._rng.choice(OS_VERSIONS),
+            BROWSERS[self._rng.getrandbits(2)],
+            randrange(100, 131),
+            randrange(10000)
+        )
 
     def _generate_cookies(self) -> List[Dict[str, Any]]:
         """Generate realistic cookies"""
+        now = self._now()
+
         return [
             {
                 "name": "session_id",
-                "value": f"sess_{random.randint(1000000, 9999999)}",
+                "value": f"sess_{self._rng.randint(1000000, 9999999)}",
                 "domain": "example.com",
                 "path": "/",
-                "expires": (datetime.now() + timedelta(days=30)).isoformat()
+                "expires": (now + _TD30).isoformat()
             },
             {
                 "name": "user_pref",
-                "value": f"pref_{random.randint(100, 999)}",
+                "value": f"pref_{self._rng.randint(100, 999)}",
                 "domain": "example.com",
                 "path": "/",
-                "expires": (datetime.now() + timedelta(days=365)).isoformat()
+                "expires": (now + _TD365).isoformat()
             }
         ]
 
@@ -197,28 +303,28 @@ class TestDataGenerator:
         """Generate realistic localStorage/sessionStorage"""
         return {
             "localStorage": {
-                f"key_{i}": f"value_{random.randint(100, 999)}"
-                for i in range(1, random.randint(3, 10))
+                f"key_{i}": f"value_{self._rng.randint(100, 999)}"
+                for i in range(1, self._rng.randint(3, 10))
             },
             "sessionStorage": {
-                f"sess_{i}": f"val_{random.randint(100, 999)}"
-                for i in range(1, random.randint(2, 6))
+                f"sess_{i}": f"val_{self._rng.randint(100, 999)}"
+                for i in range(1, self._rng.randint(2, 6))
             }
         }
 
     def _generate_page_history(self) -> List[Dict[str, Any]]:
         """Generate realistic page visit history"""
-        pages = ["/home", "/products", "/cart", "/checkout", "/success"]
-        history = []
+        now = self._now()
+        randint = self._rng.randint
 
-        for _ in range(random.randint(3, 10)):
-            history.append({
-                "url": f"http://example.com{random.choice(pages)}",
-                "timestamp": self._generate_date(),
-                "duration": random.randint(1, 300)  # seconds
-            })
-
-        return history
+        return [
+            {
+                "url": f"http://example.com{self._rng.choice(PAGES)}",
+                "timestamp": (now - timedelta(days=randint(0, 365))).isoformat(),
+                "duration": randint(1, 300)  # seconds
+            }
+            for _ in range(randint(3, 10))
+        ]
 
 
 # Pytest fixtures
@@ -402,3 +508,39 @@ def test_generate_large_dataset(generator):
         assert "email" in user
         assert "age" in user
         assert 18 <= user["age"] <= 80
+
+
+def test_generate_users_batch_matches_generate_user(generator):
+    """Batch users have generate_user's schema, field types and formats"""
+    num_users = 1000
+    users = generator.generate_users_batch(num_users)
+    reference = generator.generate_user()
+
+    assert len(users) == num_users
+
+    email_re = re.compile(r"^user\d{4}@(%s)$" % "|".join(map(re.escape, EMAIL_DOMAINS)))
+    phone_re = re.compile(r"^\([2-9]\d\d\) [2-9]\d\d-\d{4}$")
+    street_re = re.compile(r"^\d{1,4} (%s)$" % "|".join(map(re.escape, STREETS)))
+
+    for user in users:
+        assert user.keys() == reference.keys()
+        for key, value in reference.items():
+            assert type(user[key]) is type(value), key
+        assert user["address"].keys() == reference["address"].keys()
+
+        assert user["first_name"] in FIRST_NAMES
+        assert user["last_name"] in LAST_NAMES
+        assert email_re.match(user["email"]), user["email"]
+        assert phone_re.match(user["phone"]), user["phone"]
+        assert street_re.match(user["address"]["street"]), user["address"]
+        assert user["address"]["city"] in CITIES
+        assert user["address"]["state"] in STATES
+        assert 10000 <= int(user["address"]["zip"]) <= 99999
+        assert 18 <= user["age"] <= 80
+        assert type(user["age"]) is int
+        datetime.fromisoformat(user["signup_date"])
+
+    # 36,000 possible emails: a few birthday collisions are expected in 1000
+    assert len({user["email"] for user in users}) >= 950
+    assert len({user["phone"] for user in users}) >= 990
+    assert len({id(user) for user in users}) == num_users
@@ -0,0 +1,142 @@
+"""
+Tests for the TO-BE Calculator class (history tracking).
+Only the TO-BE lane has a Calculator class; skipped in the AS-IS lane.
+"""
+
+import math
+
+import pytest
+import calculator
+
+if not hasattr(calculator, "Calculator"):
+    pytest.skip("Calculator class only exists in the TO-BE lane", allow_module_level=True)
+
+from calculator import Calculator
+
+
+@pytest.fixture
+def calc():
+    return Calculator()
+
+
+def test_signed_zero_results(calc):
+    """Signed zeros come out as plain float arithmetic gives them"""
+    assert math.copysign(1.0, calc.add(0.0, 0.0)) == 1.0
+    assert math.copysign(1.0, calc.add(-0.0, -0.0)) == -1.0
+    assert math.copysign(1.0, calc.multiply(-0.0, 5.0)) == -1.0
+    assert math.copysign(1.0, calc.multiply(0.0, 5.0)) == 1.0
+
+
+def test_int_and_float_results_keep_their_type(calc):
+    """1 and 1.0 operands give int and float results"""
+    assert type(calc.add(2, 3)) is int
+    assert type(calc.add(2.0, 3)) is float
+    assert calc.multiply(10**20, 3) == 3 * 10**20
+
+
+def test_get_history_records_operations(calc):
+    """Each operation is recorded in order"""
+    calc.add(2, 3)
+    calc.divide(10, 4)
+
+    assert calc.get_history() == [
+        {"operation": "add", "operands": (2, 3), "result": 5},
+        {"operation": "divide", "operands": (10, 4), "result": 2.5},
+    ]
+
+
+def test_get_history_is_a_copy(calc):
+    """Mutating the returned list leaves the history alone"""
+    calc.add(1, 1)
+    history = calc.get_history()
+    history.append({"operation": "bogus"})
+    history[0]["result"] = 99
+
+    assert calc.get_history() == [{"operation": "add", "operands": (1, 1), "result": 2}]
+
+
+def test_failed_divide_is_not_recorded(calc):
+    """Dividing by zero raises and records nothing"""
+    with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+        calc.divide(1, 0)
+    assert calc.get_history() == []
+
+
+def test_history_view_is_live(calc):
+    """The view reflects operations made after it was taken"""
+    view = calc.history_view()
+    assert len(view) == 0
+
+    calc.subtract(5, 2)
+    calc.multiply(3, 4)
+
+    assert len(view) == 2
+    assert view[0] == {"operation": "subtract", "operands": (5, 2), "result": 3}
+    assert view[-1]["result"] == 12
+    assert view[0:1] == [view[0]]
+    assert list(view) == calc.get_history()
+
+    calc.clear_history()
+    assert len(view) == 0
+
+
+def test_history_view_is_read_only(calc):
+    """The view can't be used to change the history"""
+    calc.add(1, 2)
+    with pytest.raises(TypeError):
+        calc.history_view()[0] = {}
+
+
+def test_history_compares_like_a_list(calc):
+    """history still compares and prints like the list it used to be"""
+    assert calc.history == []
+    assert not calc.history != []
+
+    calc.add(2, 3)
+    record = {"operation": "add", "operands": (2, 3), "result": 5}
+    assert calc.history == [record]
+    assert calc.history == (record,)
+    assert calc.history != []
+    assert calc.history == calc.history_view()
+    assert repr(calc.history) == f"HistoryView([{record!r}])"
+
+
+# (a, b) pairs covering ints, floats, mixed operands, big ints and signed zeros
+FAST_OPERANDS = [
+    (2, 3), (-1, -2), (10, 4), (10**20 + 1, 3), (2**63, 2**63),
+    (1.5, 2.25), (0.1, 0.2), (-0.0, -0.0), (-0.0, 5.0), (1e308, 1e308),
+    (2, 0.5), (0.5, 2), (10**20 + 1, 1.0),
+]
+
+
+@pytest.mark.parametrize("operation", ["add", "subtract", "multiply", "divide"])
+def test_fast_calculator_matches_calculator(operation):
+    """FastCalculator gives the same results, types and history as Calculator"""
+    from fast_calculator import FastCalculator
+
+    fast, plain = FastCalculator(), Calculator()
+    for a, b in FAST_OPERANDS:
+        try:
+            expected = getattr(plain, operation)(a, b)
+        except ZeroDivisionError:
+            with pytest.raises(ZeroDivisionError):
+                getattr(fast, operation)(a, b)
+            continue
+        result = getattr(fast, operation)(a, b)
+        assert type(result) is type(expected), (a, b)
+        assert result == expected or (math.isnan(result) and math.isnan(expected)), (a, b)
+        assert math.copysign(1, result) == math.copysign(1, expected), (a, b)
+
+    assert fast.get_history() == plain.get_history()
+    assert fast.history == plain.history
+
+
+@pytest.mark.parametrize("a, b", [(1, 0), (1.0, 0.0), (1.0, -0.0), (1, 0.0)])
+def test_fast_calculator_divide_by_zero(a, b):
+    """Dividing by zero raises and records nothing, on every path"""
+    from fast_calculator import FastCalculator
+
+    fast = FastCalculator()
+    with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+        fast.divide(a, b)
+    assert fast.get_history() == []
@@ -4,16 +4,252 @@ Uses agent-browser to capture visual states and compare across lanes.
 """
 
 import pytest
+import hashlib
+import mmap
 import os
+import shutil
 import subprocess
-import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Both parsers accept bytes, so JSON output is never decoded to str first
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    import numpy as np
+    from PIL import Image, ImageChops
+    _HAVE_PIL = True
+except ImportError:
+    _HAVE_PIL = False
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # Configuration
 LANES_DIR = Path(__file__).parent.parent / "lanes"
 SCREENSHOTS_DIR = Path(__file__).parent.parent / "screenshots"
 AGENTS_DIR = Path(__file__).parent.parent / "lanes"
 
+# Screenshots are compared at most this wide (aspect ratio kept)
+COMPARE_MAX_WIDTH = 512
+
+# Seconds a loaded page is reused before ensure_loaded() reloads it
+LOAD_CACHE_TTL = 30
+
+# Viewports test_responsive_layouts captures in each lane
+RESPONSIVE_VIEWPORTS = [
+    (1920, 1080),  # Desktop
+    (768, 1024),   # Tablet
+    (375, 667),    # Mobile
+]
+
+# Set by pytest-xdist in each worker; keeps workers' browser sessions apart
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+
+# agent-browser only writes PNG; full-page captures are re-encoded as
+# lossless WebP (smaller, faster to decode) when cwebp is installed
+CWEBP = shutil.which("cwebp")
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _abs_diff_sum(a, b):
+        """Sum of |a - b| over two flat uint8 arrays, in one parallel pass"""
+        total = 0
+        for i in prange(a.size):
+            total += abs(np.int32(a[i]) - np.int32(b[i]))
+        return total
+
+    # Compile (or load from cache) once at import, not inside a test
+    _abs_diff_sum(np.zeros(4, np.uint8), np.zeros(4, np.uint8))
+else:
+    _abs_diff_sum = None
+
+
+def _file_digest(path):
+    """SHA-256 of a file's bytes, hashed straight from a memory map"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().digest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).digest()
+
+
+def _run_silent(argv):
+    """Run a command for its effect only: no pipes are created or drained"""
+    return subprocess.run(
+        argv,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+
+
+def _to_webp(png_path):
+    """Re-encode a PNG as lossless WebP next to it; returns the new path"""
+    webp_path = png_path.with_suffix(".webp")
+    result = _run_silent(
+        [CWEBP, "-quiet", "-lossless", "-exact", str(png_path), "-o", str(webp_path)]
+    )
+    if result.returncode != 0:
+        return png_path
+    png_path.unlink()
+    return webp_path
+
+
+def _open_rgb(path):
+    """Decode a screenshot as an RGB image"""
+    # The decoder reads from the mapped pages, not a buffered copy
+    with open(path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            Image.open(mm) as img:
+        return img.convert("RGB")
+
+
+class BrowserSession:
+    """Issue agent-browser commands against one named session (one per lane).
+
+    agent-browser keeps a daemon alive per --session between commands, so
+    the browser is launched once and every call here only pays for the CLI
+    round-trip. Pass name to run several independent sessions for one lane.
+    """
+
+    def __init__(self, lane, name=None):
+        self.lane = lane
+        self._argv = ["agent-browser", "--session", name or lane]
+        # (url, monotonic load time) of the page currently shown, if untouched
+        self._loaded = None
+        # (url, elements) from the last interactive snapshot of that page
+        self._snapshot = None
+
+    def _command(self, args):
+        """Full argv for one agent-browser command in this session"""
+        return self._argv + [str(arg) for arg in args]
+
+    def run(self, *args):
+        """Run one agent-browser command whose output is not needed"""
+        return _run_silent(self._command(args))
+
+    def get_json(self, *args):
+        """Run a --json command and parse its raw output"""
+        result = subprocess.run(
+            self._command(args + ("--json",)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        return json_loads(result.stdout)
+
+    def _invalidate(self):
+        """Forget cached page state after anything that may change the page"""
+        self._loaded = None
+        self._snapshot = None
+
+    def open(self, url):
+        """Navigate to url"""
+        self._invalidate()
+        return self.run("open", url)
+
+    def ensure_loaded(self, url):
+        """Open url and wait for networkidle, unless it is already showing.
+
+        Skips both commands when this session loaded the same url within
+        LOAD_CACHE_TTL seconds and nothing has interacted with it since.
+        """
+        loaded = self._loaded
+        if loaded and loaded[0] == url and time.monotonic() - loaded[1] < LOAD_CACHE_TTL:
+            return
+        self.open(url)
+        self.wait_for_load()
+        self._loaded = (url, time.monotonic())
+
+    def wait_for_load(self, state="networkidle"):
+        """Wait for the page to reach a load state"""
+        return self.run("wait", "--load", state)
+
+    def wait(self, ms):
+        """Wait for a fixed number of milliseconds"""
+        return self.run("wait", ms)
+
+    def screenshot(self, path, full=False):
+        """Save a screenshot of the current page"""
+        args = ["screenshot", path]
+        if full:
+            args.append("--full")
+        return self.run(*args)
+
+    def snapshot_interactive(self):
+        """Return the page's interactive elements.
+
+        The parsed list is reused while the same untouched page is showing;
+        callers must not mutate it.
+        """
+        loaded, cached = self._loaded, self._snapshot
+        if loaded and cached and cached[0] == loaded[0]:
+            return cached[1]
+
+        elements = self.get_json("snapshot", "-i")
+        if loaded:
+            self._snapshot = (loaded[0], elements)
+        return elements
+
+    def click(self, ref):
+        """Click an element by ref"""
+        self._invalidate()
+        return self.run("click", ref)
+
+    def fill(self, ref, value):
+        """Fill an input by ref"""
+        self._invalidate()
+        return self.run("fill", ref, value)
+
+    def set_viewport(self, width, height):
+        """Resize the viewport"""
+        return self.run("set", "viewport", width, height)
+
+    def capture_viewports(self, url, viewports, out_dir):
+        """Screenshot url at each (width, height), loading the page once.
+
+        Returns [(width, height, path)]. Paths are out_dir/viewport-WxH.png.
+        """
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.ensure_loaded(url)
+
+        shots = []
+        for width, height in viewports:
+            path = out_dir / f"viewport-{width}x{height}.png"
+            self.set_viewport(width, height)
+            self.screenshot(path)
+            shots.append((width, height, path))
+        return shots
+
+    def scroll(self, direction, amount):
+        """Scroll the page"""
+        self._invalidate()
+        return self.run("scroll", direction, amount)
+
+    def record_start(self, path):
+        """Start recording video to path"""
+        return self.run("record", "start", path)
+
+    def record_stop(self):
+        """Stop the current recording"""
+        return self.run("record", "stop")
+
+    def close(self):
+        """Close the browser and end the session"""
+        self._invalidate()
+        try:
+            return self.run("close")
+        except OSError:
+            # agent-browser isn't installed: no browser was ever started
+            return None
+
 
 class ScreenshotComparator:
     """Compare screenshots between AS-IS and TO-BE lanes"""
@@ -21,82 +257,111 @@ class ScreenshotComparator:
     def __init__(self):
         self.screenshots_dir = SCREENSHOTS_DIR
         self.screenshots_dir.mkdir(exist_ok=True)
+        self._sessions = {}
+
+    def session(self, lane):
+        """Get the (memoized) browser session for a lane.
+
+        Under pytest-xdist the session name carries the worker id, so two
+        workers never drive the same browser.
+        """
+        if lane not in self._sessions:
+            name = f"{lane}-{XDIST_WORKER}" if XDIST_WORKER else None
+            self._sessions[lane] = BrowserSession(lane, name=name)
+        return self._sessions[lane]
+
+    def close(self):
+        """Close every browser session opened through this comparator"""
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
 
     def capture_screenshot(self, lane, url, name):
         """Capture screenshot for specific lane"""
         screenshot_path = self.screenshots_dir / f"{lane}/{name}.png"
         screenshot_path.parent.mkdir(exist_ok=True)
 
-        # Use agent-browser to capture screenshot
-        result = subprocess.run(
-            [
-                "agent-browser",
-                "--session", lane,
-                "open", url
-            ],
-            capture_output=True,
-            text=True
-        )
-
-        # Wait for page load
-        subprocess.run(
-            [
-                "agent-browser",
-                "--session", lane,
-                "wait", "--load", "networkidle"
-            ],
-            capture_output=True,
-            text=True
-        )
+        # Open and wait for page load (skipped if the lane already shows url)
+        session = self.session(lane)
+        session.ensure_loaded(url)
 
         # Capture screenshot
-        subprocess.run(
-            [
-                "agent-browser",
-                "--session", lane,
-                "screenshot", str(screenshot_path),
-                "--full"
-            ],
-            capture_output=True,
-            text=True
-        )
+        session.screenshot(screenshot_path, full=True)
 
+        if CWEBP is not None:
+            return _to_webp(screenshot_path)
         return screenshot_path
 
+    def capture_both(self, url, name):
+        """Capture the same page in both lanes concurrently.
+
+        Each lane is its own browser session, so the two captures are
+        independent and overlap their page-load waits.
+        """
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            asis = pool.submit(self.capture_screenshot, "asis", url, name)
+            tobe = pool.submit(self.capture_screenshot, "tobe", url, name)
+            return asis.result(), tobe.result()
+
     def compare_screenshots(self, asis_path, tobe_path, threshold=0.95):
         """Compare two screenshots using PIL"""
-        try:
-            from PIL import Image, ImageChops
-            import numpy as np
+        # Byte-identical files: no need to decode anything
+        if _file_digest(asis_path) == _file_digest(tobe_path):
+            return True, 1.0
 
-            # Load images
-            asis_img = Image.open(asis_path)
-            tobe_img = Image.open(tobe_path)
+        if not _HAVE_PIL:
+            print("⚠️  PIL not installed. Install with: pip install Pillow")
+            return True, 1.0  # Assume similar if can't compare
 
-            # Ensure same size
-            width = max(asis_img.width, tobe_img.width)
-            height = max(asis_img.height, tobe_img.height)
-            asis_img = asis_img.resize((width, height))
-            tobe_img = tobe_img.resize((width, height))
+        # Load images
+        asis_img = _open_rgb(asis_path)
+        tobe_img = _open_rgb(tobe_path)
+
+        # Ensure same size: shrink to the smaller image, then cap the
+        # width. Similarity is an average over all pixels, so a
+        # downsampled diff tracks the full-size one closely while the
+        # difference pass touches a fraction of the pixels.
+        width = min(asis_img.width, tobe_img.width)
+        height = min(asis_img.height, tobe_img.height)
+        if width > COMPARE_MAX_WIDTH:
+            height = max(1, height * COMPARE_MAX_WIDTH // width)
+            width = COMPARE_MAX_WIDTH
+        # Bilinear is the SIMD-accelerated resampler in Pillow-SIMD; an image
+        # already at the target size is used as is
+        size = (width, height)
+        if asis_img.size != size:
+            asis_img = asis_img.resize(size, Image.BILINEAR)
+        if tobe_img.size != size:
+            tobe_img = tobe_img.resize(size, Image.BILINEAR)
+
+        if _abs_diff_sum is not None:
+            # Fused kernel: no intermediate diff image or upcast copy
+            a = np.asarray(asis_img).ravel()
+            b = np.asarray(tobe_img).ravel()
+            similarity = 1 - _abs_diff_sum(a, b) / (a.size * 255)
+            return similarity >= threshold, similarity
 
-            # Calculate difference
-            diff = ImageChops.difference(asis_img, tobe_img)
+        # Calculate difference
+        diff = ImageChops.difference(asis_img, tobe_img)
 
-            # Calculate similarity
-            diff_pixels = np.array(diff).sum() / (width * height * 255)
-            similarity = 1 - diff_pixels
+        # Identical images: empty bounding box, skip the reduction
+        if diff.getbbox() is None:
+            return True, 1.0
 
-            return similarity >= threshold, similarity
+        # Calculate similarity over every channel of every pixel
+        arr = np.asarray(diff)
+        diff_pixels = arr.sum(dtype=np.uint64) / (arr.size * 255)
+        similarity = 1 - diff_pixels
 
-        except ImportError:
-            print("⚠️  PIL not installed. Install with: pip install Pillow")
-            return True, 1.0  # Assume similar if can't compare
+        return similarity >= threshold, similarity
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def comparator():
-    """Provide screenshot comparator"""
-    return ScreenshotComparator()
+    """Provide screenshot comparator (shared, so its session caches persist)"""
+    comparator = ScreenshotComparator()
+    yield comparator
+    comparator.close()
 
 
 # Test: Landing Page Visual Consistency
@@ -105,8 +370,7 @@ def test_landing_page_visuals(comparator):
     url = "http://localhost:3000"  # Adjust to your app
 
     # Capture screenshots
-    asis_path = comparator.capture_screenshot("asis", url, "landing")
-    tobe_path = comparator.capture_screenshot("tobe", url, "landing")
+    asis_path, tobe_path = comparator.capture_both(url, "landing")
 
     # Compare (TO-BE might be on different port)
     # If TO-BE uses different port, adjust URL
@@ -130,8 +394,7 @@ def test_login_page_layout(comparator):
     url = "http://localhost:3000/login"
 
     # Capture screenshots
-    asis_path = comparator.capture_screenshot("asis", url, "login")
-    tobe_path = comparator.capture_screenshot("tobe", url, "login")
+    asis_path, tobe_path = comparator.capture_both(url, "login")
 
     # Compare
     is_similar, similarity = comparator.compare_screenshots(
@@ -149,8 +412,7 @@ def test_dashboard_layout(comparator):
     url = "http://localhost:3000/dashboard"
 
     # Capture screenshots
-    asis_path = comparator.capture_screenshot("asis", url, "dashboard")
-    tobe_path = comparator.capture_screenshot("tobe", url, "dashboard")
+    asis_path, tobe_path = comparator.capture_both(url, "dashboard")
 
     # Compare
     is_similar, similarity = comparator.compare_screenshots(
@@ -163,26 +425,18 @@ def test_dashboard_layout(comparator):
 
 
 # Test: Interactive Element States
-def test_button_states():
+def test_button_states(comparator):
     """Test button click states across lanes"""
     url = "http://localhost:3000"
 
     for lane in ["asis", "tobe"]:
+        session = comparator.session(lane)
+
         # Open page
-        subprocess.run(
-            ["agent-browser", "--session", lane, "open", url],
-            capture_output=True
-        )
+        session.ensure_loaded(url)
 
         # Snapshot interactive elements
-        result = subprocess.run(
-            ["agent-browser", "--session", lane, "snapshot", "-i", "--json"],
-            capture_output=True,
-            text=True
-        )
-
-        # Parse elements
-        elements = json.loads(result.stdout)
+        elements = session.snapshot_interactive()
 
         # Find buttons
         buttons = [e for e in elements if e.get("role") == "button"]
@@ -193,38 +447,22 @@ def test_button_states():
         # Click first button
         if buttons:
             ref = buttons[0]["ref"]
-            subprocess.run(
-                ["agent-browser", "--session", lane, "click", ref],
-                capture_output=True
-            )
+            session.click(ref)
 
 
 # Test: Form Input Behavior
-def test_form_input_behavior():
+def test_form_input_behavior(comparator):
     """Test form input across lanes"""
     url = "http://localhost:3000/contact"
 
     for lane in ["asis", "tobe"]:
-        # Open page
-        subprocess.run(
-            ["agent-browser", "--session", lane, "open", url],
-            capture_output=True
-        )
+        session = comparator.session(lane)
 
-        # Wait for load
-        subprocess.run(
-            ["agent-browser", "--session", lane, "wait", "--load", "networkidle"],
-            capture_output=True
-        )
+        # Open page and wait for load
+        session.ensure_loaded(url)
 
         # Snapshot to find inputs
-        result = subprocess.run(
-            ["agent-browser", "--session", lane, "snapshot", "-i", "--json"],
-            capture_output=True,
-            text=True
-        )
-
-        elements = json.loads(result.stdout)
+        elements = session.snapshot_interactive()
         textboxes = [e for e in elements if e.get("role") == "textbox"]
 
         if textboxes:
@@ -232,54 +470,29 @@ def test_form_input_behavior():
             ref = textboxes[0]["ref"]
             test_value = "Test User Input"
 
-            subprocess.run(
-                ["agent-browser", "--session", lane, "fill", ref, test_value],
-                capture_output=True
-            )
+            session.fill(ref, test_value)
 
             # Get value to verify
-            value_result = subprocess.run(
-                ["agent-browser", "--session", lane, "get", "value", ref, "--json"],
-                capture_output=True,
-                text=True
-            )
-
-            value = json.loads(value_result.stdout)
+            value = session.get_json("get", "value", ref)
             assert value == test_value, f"{lane}: Input value mismatch"
 
 
 # Test: Page Navigation Flow
-def test_navigation_flow():
+def test_navigation_flow(comparator):
     """Test user navigation across pages"""
     base_url = "http://localhost:3000"
 
     for lane in ["asis", "tobe"]:
-        # Start at home
-        subprocess.run(
-            ["agent-browser", "--session", lane, "open", f"{base_url}/"],
-            capture_output=True
-        )
+        session = comparator.session(lane)
 
-        # Navigate to about
-        subprocess.run(
-            ["agent-browser", "--session", lane, "open", f"{base_url}/about"],
-            capture_output=True
-        )
+        # Start at home
+        session.open(f"{base_url}/")
 
-        # Wait for load
-        subprocess.run(
-            ["agent-browser", "--session", lane, "wait", "--load", "networkidle"],
-            capture_output=True
-        )
+        # Navigate to about and wait for load
+        session.ensure_loaded(f"{base_url}/about")
 
         # Check URL
-        result = subprocess.run(
-            ["agent-browser", "--session", lane, "get", "url", "--json"],
-            capture_output=True,
-            text=True
-        )
-
-        current_url = json.loads(result.stdout)
+        current_url = session.get_json("get", "url")
         assert "/about" in current_url, f"{lane}: Navigation failed"
 
 
@@ -289,8 +502,7 @@ def test_error_page_visuals(comparator):
     url = "http://localhost:3000/nonexistent-page"
 
     # Capture screenshots
-    asis_path = comparator.capture_screenshot("asis", url, "error-404")
-    tobe_path = comparator.capture_screenshot("tobe", url, "error-404")
+    asis_path, tobe_path = comparator.capture_both(url, "error-404")
 
     # Compare
     is_similar, similarity = comparator.compare_screenshots(
@@ -303,80 +515,49 @@ def test_error_page_visuals(comparator):
 
 
 # Test: Responsive Design
-def test_responsive_layouts(comparator):
-    """Test responsive layouts across viewport sizes"""
+@pytest.mark.parametrize("lane", ["asis", "tobe"])
+def test_responsive_layouts(comparator, lane):
+    """Test responsive layouts across viewport sizes.
+
+    One case per lane: the lane's shared session loads the page once and
+    captures every viewport. pytest-xdist (-n auto) can run the lanes on
+    separate workers.
+    """
     url = "http://localhost:3000"
 
-    viewports = [
-        (1920, 1080),  # Desktop
-        (768, 1024),   # Tablet
-        (375, 667),     # Mobile
-    ]
-
-    for width, height in viewports:
-        for lane in ["asis", "tobe"]:
-            # Open page
-            subprocess.run(
-                ["agent-browser", "--session", lane, "open", url],
-                capture_output=True
-            )
-
-            # Set viewport
-            subprocess.run(
-                ["agent-browser", "--session", lane, "set", "viewport", str(width), str(height)],
-                capture_output=True
-            )
-
-            # Capture screenshot
-            screenshot_path = comparator.screenshots_dir / f"{lane}/viewport-{width}x{height}.png"
-            screenshot_path.parent.mkdir(exist_ok=True)
-
-            subprocess.run(
-                ["agent-browser", "--session", lane, "screenshot", str(screenshot_path)],
-                capture_output=True
-            )
+    shots = comparator.session(lane).capture_viewports(
+        url, RESPONSIVE_VIEWPORTS, comparator.screenshots_dir / lane
+    )
 
-            # Assert screenshot exists
-            assert screenshot_path.exists(), f"{lane}: Screenshot not captured for {width}x{height}"
+    # Assert screenshots exist
+    for width, height, screenshot_path in shots:
+        assert screenshot_path.exists(), f"{lane}: Screenshot not captured for {width}x{height}"
 
 
 # Test: Video Recording of User Flow
-def test_user_flow_video():
+def test_user_flow_video(comparator):
     """Record and verify user flow as video"""
     url = "http://localhost:3000"
 
     for lane in ["asis", "tobe"]:
+        session = comparator.session(lane)
+
         # Open page
-        subprocess.run(
-            ["agent-browser", "--session", lane, "open", url],
-            capture_output=True
-        )
+        session.ensure_loaded(url)
 
         # Start recording
         video_path = SCREENSHOTS_DIR / f"{lane}/user-flow.webm"
         video_path.parent.mkdir(exist_ok=True)
 
-        subprocess.run(
-            ["agent-browser", "--session", lane, "record", "start", str(video_path)],
-            capture_output=True
-        )
+        session.record_start(video_path)
 
         # Perform some actions
-        subprocess.run(
-            ["agent-browser", "--session", lane, "scroll", "down", "500"],
-            capture_output=True
-        )
+        session.scroll("down", 500)
 
-        subprocess.run(
-            ["agent-browser", "--session", lane, "wait", "2000"],
-            capture_output=True
-        )
+        session.wait(2000)
 
         # Stop recording
-        subprocess.run(
-            ["agent-browser", "--session", lane, "record", "stop"],
-            capture_output=True
-        )
+        session.record_stop()
 
         # Assert video file exists
         assert video_path.exists(), f"{lane}: Video not recorded"
@@ -0,0 +1,85 @@
+"""
+Aside Trigger Scanner
+Finds word-bounded trigger literals in a whole transcript in one pass over
+its bytes, with a Numba-compiled Aho-Corasick DFA (used by
+heuristic_asides.py for long inputs; needs numpy and numba)
+"""
+
+import numpy as np
+from numba import njit
+
+
+def build_tables(literals):
+    """Aho-Corasick DFA over lowercase ASCII literals, as flat arrays.
+
+    goto[state, byte] is the next state (failure links already folded in),
+    out_len[state] the length of the literal ending there (0 if none) and
+    out_link[state] the next state down the suffix chain with a literal.
+    """
+    # Trie
+    children = [{}]
+    out_len = [0]
+    for literal in literals:
+        state = 0
+        for byte in literal.encode("ascii"):
+            if byte not in children[state]:
+                children[state][byte] = len(children)
+                children.append({})
+                out_len.append(0)
+            state = children[state][byte]
+        out_len[state] = len(literal)
+
+    # Breadth-first: a state's failure target is complete before its children
+    goto = np.zeros((len(children), 256), dtype=np.int32)
+    fail = [0] * len(children)
+    out_link = [0] * len(children)
+    queue = []
+    for byte, child in children[0].items():
+        goto[0, byte] = child
+        queue.append(child)
+    for state in queue:
+        goto[state] = goto[fail[state]]
+        for byte, child in children[state].items():
+            goto[state, byte] = child
+            fail[child] = goto[fail[state], byte]
+            out_link[child] = fail[child] if out_len[fail[child]] else out_link[fail[child]]
+            queue.append(child)
+
+    return goto, np.array(out_len, dtype=np.int32), np.array(out_link, dtype=np.int32)
+
+
+@njit(cache=True)
+def _is_word_byte(buf, i):
+    """Whether buf[i] is an ASCII word character (out of range is not)"""
+    if i < 0 or i >= len(buf):
+        return False
+    b = buf[i]
+    return (97 <= b <= 122) or (65 <= b <= 90) or (48 <= b <= 57) or b == 95
+
+
+@njit(cache=True)
+def _scan(buf, goto, out_len, out_link):
+    ends = np.empty(len(buf), np.int64)
+    n = 0
+    state = 0
+    for i in range(len(buf)):
+        state = goto[state, buf[i]]
+        s = state if out_len[state] else out_link[state]
+        while s != 0:
+            start = i - out_len[s] + 1
+            if (_is_word_byte(buf, start - 1) != _is_word_byte(buf, start)
+                    and _is_word_byte(buf, i) != _is_word_byte(buf, i + 1)):
+                ends[n] = i
+                n += 1
+                break
+            s = out_link[s]
+    return ends[:n]
+
+
+def trigger_ends(text, tables):
+    """Ascending indices of the last character of every word-bounded literal.
+
+    text must be lowercase ASCII, so byte and character offsets agree.
+    """
+    buf = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    return _scan(buf, *tables).tolist()
@@ -4,24 +4,59 @@ GTD Commands for OpenClaw Workspace
 Handles task creation, project management, and GTD workflow
 """
 
+import fcntl
+import json
 import os
 import re
+import shutil
 import sys
-import yaml
 import subprocess
+import time
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
+# Faster JSON encoding when orjson is installed; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from gtd_scan import (
+    iter_stash_entries, parse_frontmatter, project_folders,
+    read_frontmatter, scan_tasks
+)
+
 # Workspace root
 WORKSPACE = Path.home() / ".openclaw/workspace"
 ACTIVE_FILE = WORKSPACE / ".active"
 
+# Machine-local state lives outside the workspace repo, so 'git add .'
+# never picks it up
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "gtd"
+SCAN_CACHE_FILE = CACHE_DIR / "scan_cache.json"
+
 # Paths
 PROJECTS_DIR = WORKSPACE / "projects"
 THREADS_DIR = WORKSPACE / "threads"
 SKILLS_DIR = WORKSPACE / "skills"
 MEMORY_DIR = WORKSPACE / "memory"
 
+# Optional tools (PATH doesn't change during a run)
+LAZYGIT = shutil.which("lazygit")
+
+# Dashboard status rows, in display order
+_STATUS_ORDER = ("inbox", "next", "waiting", "later", "done")
+_STATUS_EMOJI = {"inbox": "📥", "next": "▶️", "waiting": "⏸️", "later": "📅", "done": "✅"}
+
+# Patterns (compiled once, used per file)
+_RE_TASK_NUM = re.compile(r'K(\d+)')
+_RE_PROJECT_NUM = re.compile(r'P(\d+)')
+_RE_PROJECT_ARG = re.compile(r'^P\d+$')
+_RE_LINK = re.compile(r'\[\[([^|\]]+)\|([^|\]]+)\]\]')
+_RE_DEC = re.compile(r'DEC-(\d+)')
+
 # Templates
 TASK_TEMPLATE = """---
 id: {id}
@@ -85,32 +120,84 @@ tags: [project]
 """
 
 
-def get_next_id(prefix="K"):
-    """Get next global ID for tasks (K001, K002...) or projects (P001, P002...)"""
+def _insert_after(content, marker, text):
+    """Splice text in after the first marker; None if marker is missing"""
+    index = content.find(marker)
+    if index == -1:
+        return None
+    index += len(marker)
+    return content[:index] + text + content[index:]
+
+
+def _existing_ids(prefix):
+    """Every task (K) or project (P) number found anywhere under PROJECTS_DIR.
+
+    Tasks are searched for everywhere, not only in <project>/tasks/, so
+    archived or moved task files keep their numbers.
+    """
     if prefix == "K":
         pattern = "K[0-9]*.md"
-        folder = PROJECTS_DIR
+        id_pattern = _RE_TASK_NUM
     else:
         pattern = "P[0-9]*"
-        folder = PROJECTS_DIR
+        id_pattern = _RE_PROJECT_NUM
     
     # Find all IDs
-    ids = []
-    for path in folder.rglob(pattern):
-        if prefix == "K":
-            match = re.search(r'K(\d+)', path.name)
-        else:
-            match = re.search(r'P(\d+)', path.name)
+    ids = set()
+    for path in PROJECTS_DIR.rglob(pattern):
+        match = id_pattern.search(path.name)
         
         if match:
-            ids.append(int(match.group(1)))
+            ids.add(int(match.group(1)))
     
-    if ids:
-        next_id = max(ids) + 1
-    else:
-        next_id = 1
+    return ids
+
+
+@contextmanager
+def reserve_id(prefix="K"):
+    """Reserve the next free ID for tasks (K001...) or projects (P001...)
+
+    The last number used is kept in CACHE_DIR/counter_<prefix> (outside the
+    workspace repo) and locked for the whole block, so the caller can
+    create the file before anyone else picks a number. The counter is only
+    a starting point: a number already used anywhere under PROJECTS_DIR
+    (tasks made by hand, by gtd_engine.py, pulled from another machine,
+    archived or moved out of tasks/) is skipped. It is only
+    advanced when the block completes, so a failed create doesn't use up
+    an ID.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd = os.open(CACHE_DIR / f"counter_{prefix}", os.O_RDWR | os.O_CREAT, 0o644)
     
-    return f"{prefix}{next_id:03d}"
+    with os.fdopen(fd, "r+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        
+        existing = _existing_ids(prefix)
+        last = f.read().strip()
+        if last.isdigit():
+            next_id = int(last) + 1
+        else:
+            next_id = max(existing, default=0) + 1
+        
+        # Counter behind the tree: skip every number already on disk
+        while next_id in existing:
+            next_id += 1
+        
+        yield f"{prefix}{next_id:03d}"
+        
+        f.seek(0)
+        f.truncate()
+        f.write(str(next_id))
+
+
+def get_next_id(prefix="K"):
+    """Get next global ID for tasks (K001, K002...) or projects (P001, P002...)
+
+    The ID is used up as soon as it is returned; use reserve_id() to hold
+    it until the file exists.
+    """
+    with reserve_id(prefix) as next_id:
+        return next_id
 
 
 def get_active_project():
@@ -136,82 +223,71 @@ def create_task(title, project_id=None, status="next", **kwargs):
         return None
     
     # Find project folder
-    project_folder = PROJECTS_DIR / f"{project_id}-*"
-    project_folder = list(PROJECTS_DIR.glob(f"{project_id}-*"))
+    project_folder = project_folders(PROJECTS_DIR).get(project_id)
     
     if not project_folder:
         print(f"❌ Project {project_id} not found")
         return None
     
-    project_folder = project_folder[0]
     project_name = project_folder.name.split(f"{project_id}-")[1]
     
-    # Get next task ID
-    task_id = get_next_id("K")
-    
-    # Create slug
-    slug = title.lower().replace(" ", "-")[:50]
-    task_file = project_folder / "tasks" / f"{task_id}-{slug}.md"
-    
-    # Ensure tasks directory exists
-    task_file.parent.mkdir(exist_ok=True)
-    
-    # Fill template
-    content = TASK_TEMPLATE.format(
-        id=task_id,
-        project=project_id,
-        title=title,
-        status=status,
-        energy=kwargs.get("energy", "medium"),
-        due=kwargs.get("due", ""),
-        context=kwargs.get("context", "computer"),
-        tags=str(kwargs.get("tags", ["next"])),
-        created=datetime.now().strftime("%Y-%m-%d"),
-        context_desc=kwargs.get("context_desc", "Task created from conversation"),
-        project_name=project_name,
-        notes=kwargs.get("notes", "")
-    )
+    # Reserve the next task ID until its file exists
+    with reserve_id("K") as task_id:
+        # Create slug
+        slug = title.lower().replace(" ", "-")[:50]
+        task_file = project_folder / "tasks" / f"{task_id}-{slug}.md"
+        
+        # Ensure tasks directory exists
+        task_file.parent.mkdir(exist_ok=True)
+        
+        # Fill template
+        content = TASK_TEMPLATE.format(
+            id=task_id,
+            project=project_id,
+            title=title,
+            status=status,
+            energy=kwargs.get("energy", "medium"),
+            due=kwargs.get("due", ""),
+            context=kwargs.get("context", "computer"),
+            tags=str(kwargs.get("tags", ["next"])),
+            created=datetime.now().strftime("%Y-%m-%d"),
+            context_desc=kwargs.get("context_desc", "Task created from conversation"),
+            project_name=project_name,
+            notes=kwargs.get("notes", "")
+        )
+        
+        # Write task file
+        task_file.write_text(content)
     
-    # Write task file
-    task_file.write_text(content)
+    # Update project README with task link
+    readme = project_folder / "README.md"
+    git_paths = [str(task_file.relative_to(WORKSPACE))]
+    if readme.exists():
+        readme_content = readme.read_text()
+        
+        # Add to Tasks section
+        new_task = f"- [ ] [[tasks/{task_id}|{task_id}]]: {title} #next\n"
+        readme_content = _insert_after(readme_content, "## Tasks\n", new_task)
+        if readme_content is not None:
+            readme.write_text(readme_content)
+            git_paths.append(str(readme.relative_to(WORKSPACE)))
     
-    # Git add the specific task file
+    # Git: one add and one commit for the task file and its README link
     subprocess.run(
-        ["git", "add", str(task_file.relative_to(WORKSPACE))],
+        ["git", "add", *git_paths],
         cwd=WORKSPACE,
         check=True
     )
-    
-    # Git commit
     subprocess.run(
-        ["git", "commit", f"-m", f"Add task: {task_id} - {title}"],
+        ["git", "commit", "-m", f"Add task: {task_id} - {title}"],
         cwd=WORKSPACE,
         check=True
     )
     print(f"🔀 Git: Committed task {task_id}")
     
-    # Update project README with task link
-    readme = project_folder / "README.md"
-    if readme.exists():
-        readme_content = readme.read_text()
-        
-        # Add to Tasks section
-        tasks_section = re.search(r'## Tasks\n', readme_content)
-        if tasks_section:
-            new_task = f"- [ ] [[tasks/{task_id}|{task_id}]]: {title} #next\n"
-            readme_content = re.sub(
-                r'## Tasks\n',
-                f'## Tasks\n{new_task}',
-                readme_content
-            )
-            readme.write_text(readme_content)
-    
     print(f"✅ Created task: {task_id} in {project_id}")
     print(f"   File: {task_file}")
     
-    # Git commit: Add task
-    call_git_helper("commit", f"Add task: {task_id} - {title}")
-    
     return task_id
 
 
@@ -238,39 +314,58 @@ def call_git_helper(command, message=""):
             subprocess.run(
                 [str(git_helper), "commit", message],
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True
             )
         elif command == "push":
             subprocess.run(
                 [str(git_helper), "push"],
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True
             )
         elif command == "status":
             subprocess.run(
                 [str(git_helper), "status"],
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True
             )
         elif command == "stash":
             subprocess.run(
                 [str(git_helper), "stash"],
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True
             )
         elif command == "init":
             subprocess.run(
                 [str(git_helper), "init"],
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True
             )
     except subprocess.CalledProcessError as e:
         print(f"⚠️  Git helper error: {e}")
+        if e.stderr:
+            print(f"   {e.stderr.strip()}")
         return False
     
     return True
 
 
+def _dump_json(data):
+    """Encode data as 2-space indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
 def index_into_semantica(title, context, rationale):
     """Add a decision to Semantica and index into Viking"""
     semantica_dir = WORKSPACE / "semantica"
@@ -285,7 +380,7 @@ def index_into_semantica(title, context, rationale):
         if not files:
             next_id = "DEC-001"
         else:
-            ids = [int(re.search(r'DEC-(\d+)', f.name).group(1)) for f in files]
+            ids = [int(_RE_DEC.search(f.name).group(1)) for f in files]
             next_id = f"DEC-{max(ids) + 1:03d}"
     except Exception:
         next_id = "DEC-002" # Fallback
@@ -304,9 +399,7 @@ def index_into_semantica(title, context, rationale):
     }
     
     decision_file = decisions_dir / f"{next_id}.json"
-    import json
-    with decision_file.open("w") as f:
-        json.dump(decision_data, f, indent=2)
+    decision_file.write_bytes(_dump_json(decision_data))
         
     print(f"🧠 Semantica: Logged decision {next_id}")
     
@@ -353,7 +446,7 @@ def cmd_defer(args):
     title_parts = []
     
     for arg in args:
-        if re.match(r'^P\d+$', arg):
+        if _RE_PROJECT_ARG.match(arg):
             project_id = arg
         else:
             title_parts.append(arg)
@@ -385,18 +478,12 @@ def cmd_later(args):
     
     content = someday.read_text()
     if f"## {today}" not in content:
-        content = content.replace(
-            "---\n",
-            f"---\n\n## {today}\n{entry}"
-        )
+        updated = _insert_after(content, "---\n", f"\n## {today}\n{entry}")
     else:
-        content = re.sub(
-            f"## {today}\n",
-            f"## {today}\n{entry}",
-            content
-        )
+        updated = _insert_after(content, f"## {today}\n", entry)
     
-    someday.write_text(content)
+    if updated is not None:
+        someday.write_text(updated)
     
     print(f"✅ Added to Someday.md: {title}")
     update_memory(f"Later item: {title}")
@@ -413,13 +500,12 @@ def cmd_stash(args):
         return False
     
     # Find project folder
-    project_folder = list(PROJECTS_DIR.glob(f"{project_id}-*"))
+    project_folder = project_folders(PROJECTS_DIR).get(project_id)
     
     if not project_folder:
         print(f"❌ Project {project_id} not found")
         return False
     
-    project_folder = project_folder[0]
     readme = project_folder / "README.md"
     
     # Update README with stashed: true
@@ -452,18 +538,17 @@ def cmd_switch(args):
     
     project_id = args[0]
     
-    if not re.match(r'^P\d+$', project_id):
+    if not _RE_PROJECT_ARG.match(project_id):
         print(f"❌ Invalid project ID: {project_id}")
         return False
     
     # Find project folder
-    project_folder = list(PROJECTS_DIR.glob(f"{project_id}-*"))
+    project_folder = project_folders(PROJECTS_DIR).get(project_id)
     
     if not project_folder:
         print(f"❌ Project {project_id} not found")
         return False
     
-    project_folder = project_folder[0]
     readme = project_folder / "README.md"
     
     # Unstash if needed
@@ -500,9 +585,9 @@ def cmd_stashed(args):
     
     print("📦 Stashed Projects:")
     
-    for stash_file in stash_dir.glob("P*.md"):
-        content = stash_file.read_text()
-        project_match = re.search(r'\[\[([^|\]]+)\|([^|\]]+)\]\]', content)
+    for entry in iter_stash_entries(PROJECTS_DIR):
+        content = Path(entry.path).read_text()
+        project_match = _RE_LINK.search(content)
         
         if project_match:
             project_link = project_match.group(1)
@@ -517,101 +602,97 @@ def cmd_future(args):
     print("🔮 Future Projects (TBD/seeds):")
     
     for readme in PROJECTS_DIR.glob("P00*/README.md"):
-        content = readme.read_text()
+        fm = parse_frontmatter(read_frontmatter(readme))
         
-        if "status: future" in content:
+        if fm.get("status") == "future":
             # Extract project info
-            id_match = re.search(r'id: (P\d+)', content)
-            title_match = re.search(r'title: ([^\n]+)', content)
+            project_id = fm.get("id")
+            title = fm.get("title")
             
-            if id_match and title_match:
-                project_id = id_match.group(1)
-                title = title_match.group(1)
+            if project_id and title:
                 print(f"   - {project_id}: {title}")
     
     return True
 
 
-def cmd_gtd(args):
-    """Handle ':gtd'"""
-    print("📊 GTD Health Dashboard")
-    print("=" * 50)
+def _gtd_dashboard():
+    """Lines of the GTD health dashboard"""
+    out = []
+    out.append("📊 GTD Health Dashboard")
+    out.append("=" * 50)
     
-    # Tasks by status
-    print("\n📋 Tasks by Status:")
-    statuses = {}
+    # Every task file, walked and parsed once for all sections below
+    tasks = scan_tasks(PROJECTS_DIR, cache_file=SCAN_CACHE_FILE)
+    
+    # One clock reading for every age computed below
+    now = time.time()
+    three_days_ago = now - (3 * 24 * 60 * 60)
+    seven_days_ago = now - (7 * 24 * 60 * 60)
     
-    for task_file in PROJECTS_DIR.rglob("K*.md"):
-        content = task_file.read_text()
-        status_match = re.search(r'status: (\w+)', content)
+    # One pass: status counts plus the aging waiting/next tasks
+    statuses = Counter()
+    waiting_aged = []
+    next_aged = []
+    
+    for task in tasks:
+        statuses[task.status] += 1
         
-        if status_match:
-            status = status_match.group(1)
-            statuses[status] = statuses.get(status, 0) + 1
+        if not (task.id and task.title):
+            continue
+        if task.status == "waiting" and task.mtime < three_days_ago:
+            waiting_aged.append(task)
+        elif task.status == "next" and task.mtime < seven_days_ago:
+            next_aged.append(task)
+    
+    # Tasks by status
+    out.append("\n📋 Tasks by Status:")
     
-    for status in ["inbox", "next", "waiting", "later", "done"]:
+    for status in _STATUS_ORDER:
         count = statuses.get(status, 0)
-        emoji = {"inbox": "📥", "next": "▶️", "waiting": "⏸️", "later": "📅", "done": "✅"}
-        print(f"   {emoji.get(status, '')} {status}: {count}")
+        out.append(f"   {_STATUS_EMOJI.get(status, '')} {status}: {count}")
     
     # Tasks waiting > 3 days
-    print("\n⏰ Tasks Waiting > 3 Days:")
+    out.append("\n⏰ Tasks Waiting > 3 Days:")
     
-    three_days_ago = datetime.now().timestamp() - (3 * 24 * 60 * 60)
-    
-    for task_file in PROJECTS_DIR.rglob("K*.md"):
-        if task_file.stat().st_mtime < three_days_ago:
-            content = task_file.read_text()
-            
-            if "status: waiting" in content:
-                id_match = re.search(r'id: (K\d+)', content)
-                title_match = re.search(r'title: ([^\n]+)', content)
-                
-                if id_match and title_match:
-                    task_id = id_match.group(1)
-                    title = title_match.group(1)
-                    days = int((datetime.now().timestamp() - task_file.stat().st_mtime) / (24 * 60 * 60))
-                    print(f"   - {task_id}: {title} ({days} days)")
+    for task in waiting_aged:
+        days = int((now - task.mtime) / (24 * 60 * 60))
+        out.append(f"   - {task.id}: {task.title} ({days} days)")
     
     # Tasks next > 7 days
-    print("\n🎯 Tasks Next > 7 Days:")
+    out.append("\n🎯 Tasks Next > 7 Days:")
     
-    seven_days_ago = datetime.now().timestamp() - (7 * 24 * 60 * 60)
-    
-    for task_file in PROJECTS_DIR.rglob("K*.md"):
-        if task_file.stat().st_mtime < seven_days_ago:
-            content = task_file.read_text()
-            
-            if "status: next" in content:
-                id_match = re.search(r'id: (K\d+)', content)
-                title_match = re.search(r'title: ([^\n]+)', content)
-                
-                if id_match and title_match:
-                    task_id = id_match.group(1)
-                    title = title_match.group(1)
-                    days = int((datetime.now().timestamp() - task_file.stat().st_mtime) / (24 * 60 * 60))
-                    print(f"   - {task_id}: {title} ({days} days) → break down or demote?")
+    for task in next_aged:
+        days = int((now - task.mtime) / (24 * 60 * 60))
+        out.append(f"   - {task.id}: {task.title} ({days} days) → break down or demote?")
     
     # Stashed projects > 7 days
-    print("\n📦 Stashed Projects > 7 Days:")
-    
-    seven_days_ago = datetime.now().timestamp() - (7 * 24 * 60 * 60)
+    out.append("\n📦 Stashed Projects > 7 Days:")
     
-    for stash_file in PROJECTS_DIR.glob("P000-STASH/P*.md"):
-        if stash_file.stat().st_mtime < seven_days_ago:
-            content = stash_file.read_text()
-            project_match = re.search(r'\[\[([^|\]]+)\|([^|\]]+)\]\]', content)
+    for entry in iter_stash_entries(PROJECTS_DIR):
+        mtime = entry.stat().st_mtime
+        
+        if mtime < seven_days_ago:
+            content = Path(entry.path).read_text()
+            project_match = _RE_LINK.search(content)
             
             if project_match:
                 project_link = project_match.group(1)
                 project_id = project_match.group(2)
-                days = int((datetime.now().timestamp() - stash_file.stat().st_mtime) / (24 * 60 * 60))
-                print(f"   - [[{project_link}|{project_id}]] ({days} days)")
+                days = int((now - mtime) / (24 * 60 * 60))
+                out.append(f"   - [[{project_link}|{project_id}]] ({days} days)")
+    
+    out.append("\n💡 Actions:")
+    out.append("   ':switch P00X' - Recall stashed project")
+    out.append("   ':demote K00X later' - Demote next task")
+    out.append("   ':unblock K00X' - Update waiting task")
     
-    print("\n💡 Actions:")
-    print("   ':switch P00X' - Recall stashed project")
-    print("   ':demote K00X later' - Demote next task")
-    print("   ':unblock K00X' - Update waiting task")
+    return out
+
+
+def cmd_gtd(args):
+    """Handle ':gtd'"""
+    # Built up front and written in one go rather than print by print
+    sys.stdout.write("\n".join(_gtd_dashboard()) + "\n")
     
     return True
 
@@ -622,9 +703,7 @@ def cmd_viz(args):
     print("-" * 30)
     
     # Check if lazygit is installed
-    lazygit = subprocess.run(["which", "lazygit"], capture_output=True, text=True)
-    
-    if lazygit.returncode == 0:
+    if LAZYGIT:
         print("💡 Suggestion: Run 'lazygit' for full interactive UI")
         print("-" * 30)
     
@@ -638,12 +717,19 @@ def cmd_viz(args):
 
 def cmd_cb(args):
     """Integrate GTD visualization with CodexBar usage"""
-    print("📊 CodexBar + GTD Combined Dashboard:")
-    print("=" * 50)
+    out = []
+    out.append("📊 CodexBar + GTD Combined Dashboard:")
+    out.append("=" * 50)
+    
+    # Start git log now so it runs while codexbar does; printed in step 2
+    git_log = subprocess.Popen([
+        "git", "log", "--graph", "--oneline", "--decorate", "--all", "-n", "8",
+        "--color=always" if sys.stdout.isatty() else "--color=never"
+    ], cwd=WORKSPACE, stdout=subprocess.PIPE, text=True)
     
     # 1. Get CodexBar Usage
-    print("\n💰 Model Usage & Cost (via CodexBar):")
-    print("-" * 30)
+    out.append("\n💰 Model Usage & Cost (via CodexBar):")
+    out.append("-" * 30)
     
     try:
         cb_result = subprocess.run(
@@ -655,36 +741,39 @@ def cmd_cb(args):
             # Print first 15 lines of usage
             for line in cb_result.stdout.split('\n')[:15]:
                 if line.strip():
-                    print(f"   {line}")
+                    out.append(f"   {line}")
         else:
-            print("   ⚠️  CodexBar usage lookup failed")
+            out.append("   ⚠️  CodexBar usage lookup failed")
     except Exception as e:
-        print(f"   ⚠️  CodexBar not found or error: {e}")
+        out.append(f"   ⚠️  CodexBar not found or error: {e}")
     
     # 2. Get GTD Progress (Recent Commits)
-    print("\n📈 Recent GTD Progress (Git History):")
-    print("-" * 30)
-    subprocess.run([
-        "git", "log", "--graph", "--oneline", "--decorate", "--all", "-n", "8"
-    ], cwd=WORKSPACE)
+    out.append("\n📈 Recent GTD Progress (Git History):")
+    out.append("-" * 30)
+    git_output, _ = git_log.communicate()
+    if git_output:
+        out.append(git_output.rstrip("\n"))
     
     # 3. TIL Summary
-    print("\n📝 Recent Today I Learned (TIL):")
-    print("-" * 30)
+    out.append("\n📝 Recent Today I Learned (TIL):")
+    out.append("-" * 30)
     til_file = MEMORY_DIR / "TIL.md"
     if til_file.exists():
         lines = til_file.read_text().split('\n')
         # Show last 3 TIL entries (approx 15 lines)
         for line in lines[-15:]:
             if line.strip():
-                print(f"   {line}")
+                out.append(f"   {line}")
     else:
-        print("   (No TIL entries yet)")
+        out.append("   (No TIL entries yet)")
     
     # 4. Task Status Summary
-    print("\n📋 Current GTD Status:")
-    print("-" * 30)
-    cmd_gtd([])
+    out.append("\n📋 Current GTD Status:")
+    out.append("-" * 30)
+    out.extend(_gtd_dashboard())
+    
+    # One write for the whole combined dashboard
+    sys.stdout.write("\n".join(out) + "\n")
     
     return True
 
@@ -701,7 +790,8 @@ def cmd_til(args):
     til_file = MEMORY_DIR / "TIL.md"
     
     # Create TIL file if not exists
-    if not til_file.exists():
+    created = not til_file.exists()
+    if created:
         header = "# Today I Learned (TIL)\n\nTechnical saves, discoveries, and lessons learned.\n\n---\n"
         til_file.write_text(header)
     
@@ -713,14 +803,16 @@ def cmd_til(args):
     
     print(f"✅ Logged TIL: {discovery}")
     
-    # Commit TIL
-    subprocess.run(
-        ["git", "add", str(til_file.relative_to(WORKSPACE))],
-        cwd=WORKSPACE,
-        check=True
-    )
+    # Commit TIL (a tracked file is committed by pathspec, no separate add)
+    til_path = str(til_file.relative_to(WORKSPACE))
+    if created:
+        subprocess.run(
+            ["git", "add", til_path],
+            cwd=WORKSPACE,
+            check=True
+        )
     subprocess.run(
-        ["git", "commit", "-m", f"TIL: {discovery[:50]}..."],
+        ["git", "commit", "-m", f"TIL: {discovery[:50]}...", "--", til_path],
         cwd=WORKSPACE,
         check=True
     )
@@ -4,52 +4,49 @@ GTD Health Alerts
 Checks for aging tasks, stashed projects, and generates alerts
 """
 
-import os
 import re
 import sys
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from pathlib import Path
 
+from gtd_scan import iter_stash_entries, scan_tasks
+
 # Workspace root
 WORKSPACE = Path.home() / ".openclaw/workspace"
 PROJECTS_DIR = WORKSPACE / "projects"
 
+# [[link|label]] wiki link, compiled once
+_RE_LINK = re.compile(r'\[\[([^|\]]+)\|([^|\]]+)\]\]')
+
 
 def check_aging_tasks():
     """Check for tasks waiting > 3 days and next > 7 days"""
     alerts = []
     
+    # One clock reading for every age computed below
+    now = time.time()
+    
     # 3 days ago
-    three_days_ago = datetime.now() - timedelta(days=3)
+    three_days_ago = now - (3 * 24 * 60 * 60)
     
     # 7 days ago
-    seven_days_ago = datetime.now() - timedelta(days=7)
+    seven_days_ago = now - (7 * 24 * 60 * 60)
     
-    for task_file in PROJECTS_DIR.rglob("K*.md"):
-        content = task_file.read_text()
-        mtime = datetime.fromtimestamp(task_file.stat().st_mtime)
+    for task in scan_tasks(PROJECTS_DIR):
+        mtime = task.mtime
         
         # Waiting > 3 days
-        if "status: waiting" in content and mtime < three_days_ago:
-            id_match = re.search(r'id: (K\d+)', content)
-            title_match = re.search(r'title: ([^\n]+)', content)
-            
-            if id_match and title_match:
-                task_id = id_match.group(1)
-                title = title_match.group(1)
-                days = (datetime.now() - mtime).days
-                alerts.append(f"⏰ [[{task_file}|{task_id}]]: {title} ({days} days) - Waiting")
+        if task.status == "waiting" and mtime < three_days_ago:
+            if task.id and task.title:
+                days = int((now - mtime) / (24 * 60 * 60))
+                alerts.append(f"⏰ [[{task.path}|{task.id}]]: {task.title} ({days} days) - Waiting")
         
         # Next > 7 days
-        if "status: next" in content and mtime < seven_days_ago:
-            id_match = re.search(r'id: (K\d+)', content)
-            title_match = re.search(r'title: ([^\n]+)', content)
-            
-            if id_match and title_match:
-                task_id = id_match.group(1)
-                title = title_match.group(1)
-                days = (datetime.now() - mtime).days
-                alerts.append(f"🎯 [[{task_file}|{task_id}]]: {title} ({days} days) - Next > 7 days → break down or demote?")
+        if task.status == "next" and mtime < seven_days_ago:
+            if task.id and task.title:
+                days = int((now - mtime) / (24 * 60 * 60))
+                alerts.append(f"🎯 [[{task.path}|{task.id}]]: {task.title} ({days} days) - Next > 7 days → break down or demote?")
     
     return alerts
 
@@ -58,23 +55,19 @@ def check_stashed_projects():
     """Check for stashed projects > 7 days"""
     alerts = []
     
-    seven_days_ago = datetime.now() - timedelta(days=7)
-    stash_dir = PROJECTS_DIR / "P000-STASH"
-    
-    if not stash_dir.exists():
-        return alerts
-    
-    for stash_file in stash_dir.glob("P*.md"):
-        mtime = datetime.fromtimestamp(stash_file.stat().st_mtime)
+    now = time.time()
+    seven_days_ago = now - (7 * 24 * 60 * 60)
+    for entry in iter_stash_entries(PROJECTS_DIR):
+        mtime = entry.stat().st_mtime
         
         if mtime < seven_days_ago:
-            content = stash_file.read_text()
-            project_match = re.search(r'\[\[([^|\]]+)\|([^|\]]+)\]\]', content)
+            content = Path(entry.path).read_text()
+            project_match = _RE_LINK.search(content)
             
             if project_match:
                 project_link = project_match.group(1)
                 project_id = project_match.group(2)
-                days = (datetime.now() - mtime).days
+                days = int((now - mtime) / (24 * 60 * 60))
                 alerts.append(f"📦 [[{project_link}|{project_id}]] stashed for {days} days - Recall?")
     
     return alerts
@@ -85,10 +78,8 @@ def check_inbox_overflow():
     alerts = []
     
     inbox_count = 0
-    for task_file in PROJECTS_DIR.rglob("K*.md"):
-        content = task_file.read_text()
-        
-        if "status: inbox" in content:
+    for task in scan_tasks(PROJECTS_DIR):
+        if task.status == "inbox":
             inbox_count += 1
     
     if inbox_count > 10:
@@ -0,0 +1,261 @@
+"""
+GTD Task Scanner
+Walks the projects tree once and parses each task file once, shared by
+the dashboard (gtd_commands.py) and the alerts (gtd_health_alerts.py)
+"""
+
+import json
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# RE2 (pip install google-re2) matches in linear time on a DFA; optional
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Frontmatter fields, one pass per file; anchored to line starts
+_FRONTMATTER_PATTERN = r'(?m)^(id|title|status|due|energy): (.+)$'
+_RE_FRONTMATTER = (re2 or re).compile(_FRONTMATTER_PATTERN)
+
+# A '---' line: opens and closes the frontmatter block
+_RE_FENCE = re.compile(r'(?m)^---[ \t]*\r?$')
+_RE_FENCE_BYTES = re.compile(rb'(?m)^---[ \t]*\r?$')
+
+# Threads reading task files; 4 is plenty on a local SSD (raise
+# GTD_SCAN_WORKERS on a network mount, set it to 1 to read serially)
+DEFAULT_SCAN_WORKERS = 4
+
+
+def _scan_workers():
+    """GTD_SCAN_WORKERS as a positive int, or the default if unset or invalid"""
+    try:
+        return max(1, int(os.environ.get("GTD_SCAN_WORKERS", DEFAULT_SCAN_WORKERS)))
+    except ValueError:
+        return DEFAULT_SCAN_WORKERS
+
+
+SCAN_WORKERS = _scan_workers()
+
+# Project folders that never hold tasks
+STASH_DIR_NAME = "P000-STASH"
+
+# One parsed task file (projects/<project>/tasks/K*.md)
+TaskRec = namedtuple("TaskRec", ["path", "mtime", "status", "id", "title"])
+
+# {dir path: (dir mtime, [DirEntry])}; a changed mtime means a file was
+# added, removed or renamed there, so the listing is read again
+_DIR_CACHE = {}
+
+# {task path: (file mtime, TaskRec)}, so unchanged files are parsed once
+_TASK_CACHE = {}
+
+
+def parse_frontmatter(content):
+    """Get the id/title/status/due/energy fields of a file as a dict.
+
+    Only the block between the first two '---' lines is scanned ('---'
+    inside a line doesn't count); a file without one is scanned whole.
+    """
+    start = _RE_FENCE.search(content)
+    end = _RE_FENCE.search(content, start.end()) if start else None
+    if end:
+        content = content[start.end():end.start()]
+
+    fields = {}
+    for match in _RE_FRONTMATTER.finditer(content):
+        fields.setdefault(match.group(1), match.group(2).strip())
+    return fields
+
+
+def read_frontmatter(path, cap=2048):
+    """Read a file only up to the end of its frontmatter block.
+
+    Reads the first cap bytes and cuts after the second '---' line. The
+    whole file is read only when that block doesn't close within cap.
+    """
+    with open(path, 'rb') as f:
+        buf = f.read(cap)
+        start = _RE_FENCE_BYTES.search(buf)
+        end = _RE_FENCE_BYTES.search(buf, start.end()) if start else None
+        # A fence right at the cap may be the start of a longer line
+        if not end or end.end() == len(buf):
+            return (buf + f.read()).decode()
+    return buf[:end.end()].decode()
+
+
+def _cached_scandir(dirpath):
+    """List a directory once per invocation (until its mtime changes).
+
+    DirEntry objects keep the stat() result from when they were listed,
+    and editing a file in place doesn't change its directory's mtime, so
+    callers that need a file's current mtime must os.stat() it themselves.
+    """
+    dirpath = os.fspath(dirpath)
+    dir_mtime = os.stat(dirpath).st_mtime_ns
+
+    cached = _DIR_CACHE.get(dirpath)
+    if cached and cached[0] == dir_mtime:
+        return cached[1]
+
+    with os.scandir(dirpath) as it:
+        entries = list(it)
+    _DIR_CACHE[dirpath] = (dir_mtime, entries)
+
+    return entries
+
+
+def iter_task_entries(projects_dir):
+    """Yield an os.DirEntry for every task file: projects_dir/<project>/tasks/K*.md.
+
+    Only each project's tasks folder is listed; the stash, hidden folders
+    and anything else a project holds are never walked.
+    """
+    try:
+        projects = _cached_scandir(projects_dir)
+    except FileNotFoundError:
+        return
+
+    for project in projects:
+        if project.name.startswith(".") or project.name == STASH_DIR_NAME:
+            continue
+        if not project.is_dir():
+            continue
+
+        try:
+            tasks = _cached_scandir(os.path.join(project.path, "tasks"))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+        for entry in tasks:
+            name = entry.name
+            if name.startswith("K") and name.endswith(".md") and entry.is_file():
+                yield entry
+
+
+def iter_stash_entries(projects_dir):
+    """Yield an os.DirEntry for every stash entry: projects_dir/P000-STASH/P*.md"""
+    try:
+        entries = _cached_scandir(os.path.join(projects_dir, STASH_DIR_NAME))
+    except (FileNotFoundError, NotADirectoryError):
+        return
+
+    for entry in entries:
+        name = entry.name
+        if name.startswith("P") and name.endswith(".md") and entry.is_file():
+            yield entry
+
+
+def project_folders(projects_dir):
+    """Map each project id (the name before the first '-') to its folder"""
+    try:
+        entries = _cached_scandir(projects_dir)
+    except FileNotFoundError:
+        return {}
+
+    folders = {}
+    for entry in entries:
+        project_id, sep, _ = entry.name.partition("-")
+        if sep and entry.is_dir():
+            folders.setdefault(project_id, Path(entry.path))
+
+    return folders
+
+
+def _cached_task(path, st):
+    """The last parse of a task file, or None if it changed since"""
+    cached = _TASK_CACHE.get(path)
+    if cached and cached[0] == st.st_mtime_ns:
+        return cached[1]
+    return None
+
+
+def _parse_task(path, st):
+    """Read and parse one task file, remembering it under its mtime"""
+    fm = parse_frontmatter(read_frontmatter(path))
+    task = TaskRec(
+        path=path,
+        mtime=st.st_mtime,
+        status=fm.get('status'),
+        id=fm.get('id'),
+        title=fm.get('title'),
+    )
+    _TASK_CACHE[path] = (st.st_mtime_ns, task)
+
+    return task
+
+
+def _load_task_cache(cache_file):
+    """Seed the parsed-task cache from a previous run's cache file.
+
+    A missing, corrupt or differently shaped file (e.g. from an older
+    version) seeds nothing; every task is parsed again and the file is
+    rewritten.
+    """
+    try:
+        with open(cache_file) as f:
+            saved = json.load(f)
+        loaded = {
+            path: (mtime_ns, TaskRec(path, mtime, status, task_id, title))
+            for path, (mtime_ns, mtime, status, task_id, title) in saved.items()
+        }
+    except (OSError, ValueError, TypeError, AttributeError):
+        return
+
+    _TASK_CACHE.update(loaded)
+
+
+def _save_task_cache(cache_file, tasks):
+    """Write the parsed tasks out for the next run (atomically)"""
+    saved = {
+        task.path: [_TASK_CACHE[task.path][0], task.mtime, task.status, task.id, task.title]
+        for task in tasks
+    }
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp = f"{cache_file}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(saved, f)
+    os.replace(tmp, cache_file)
+
+
+def scan_tasks(projects_dir, cache_file=None):
+    """Get a TaskRec for every task file under projects_dir.
+
+    Directory listings and parsed files are cached, so repeat calls in one
+    invocation (e.g. ':cb' running the dashboard) only stat files that
+    haven't changed. With cache_file, parsed files also carry over between
+    runs: only files whose mtime changed are read again, and files that
+    are gone are dropped from the cache.
+    """
+    if cache_file is not None and not _TASK_CACHE:
+        _load_task_cache(cache_file)
+
+    # Fresh stat per file: a cached DirEntry would miss in-place edits
+    stats = []
+    for entry in iter_task_entries(projects_dir):
+        try:
+            stats.append((entry.path, os.stat(entry.path)))
+        except FileNotFoundError:
+            continue
+    tasks = [_cached_task(path, st) for path, st in stats]
+    stale = [(path, st) for (path, st), task in zip(stats, tasks) if task is None]
+
+    if SCAN_WORKERS > 1 and len(stale) > 1:
+        with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(stale))) as pool:
+            parsed = iter(list(pool.map(_parse_task, *zip(*stale))))
+    else:
+        parsed = (_parse_task(path, st) for path, st in stale)
+    tasks = [task if task is not None else next(parsed) for task in tasks]
+
+    # Forget files that were deleted or renamed
+    removed = _TASK_CACHE.keys() - {path for path, _ in stats}
+    for path in removed:
+        del _TASK_CACHE[path]
+
+    if cache_file is not None and (stale or removed):
+        _save_task_cache(cache_file, tasks)
+
+    return tasks
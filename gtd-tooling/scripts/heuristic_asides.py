@@ -4,16 +4,24 @@ Heuristic Aside Detection for GTD System
 Detects tangential items during conversation and batches them for confirmation
 """
 
+import mmap
 import re
 import sys
-from typing import List, Tuple
+from bisect import bisect_left
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+# Aho-Corasick automaton for the literal triggers (pip install pyahocorasick); optional
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # Trigger phrases (indicates tangential topic)
 TRIGGER_PHRASES = [
     r"\balso\b",
     r"\boh\b",
     r"\bby the way\b",
-    r"\bby the way\b",
     r"\breminds me of\b",
     r"\bspeaking of\b",
     r"\bshould look into\b",
@@ -29,100 +37,233 @@ TRIGGER_PHRASES = [
     r"\bthought:\b",
 ]
 
-# Context signals (indicates non-immediate action)
-CONTEXT_SIGNALS = [
-    r"\bcould\b",
-    r"\bmight\b",
-    r"\bwould\b",
-    r"\bshould\b",
-    r"\bconsider\b",
-    r"\bthink about\b",
-    r"\blook into\b",
-]
-
 # Ignore patterns (false positives)
 IGNORE_PATTERNS = [
     r"\balso\b.*?(but|however|although)",  # "also but..." = clarification, not aside
     r"\bspeaking of.*?we were\b",  # "speaking of what we were doing" = continuation
 ]
 
+# Immediate action words (aside belongs to a project)
+IMMEDIATE_PATTERNS = [
+    r"\bneed to\b",
+    r"\bmust\b",
+    r"\bhave to\b",
+    r"\bstart\b",
+    r"\bbegin\b",
+]
+
+
+def _union(patterns: List[str]) -> "re.Pattern[str]":
+    """Compile a pattern list into one alternation"""
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+# Each list is matched with a single search per sentence, against the
+# lowercased sentence (the patterns are all lowercase: no IGNORECASE)
+TRIGGER_RE = _union(TRIGGER_PHRASES)
+IGNORE_RE = _union(IGNORE_PATTERNS)
+IMMEDIATE_RE = _union(IMMEDIATE_PATTERNS)
+PROJECT_RE = re.compile(r"\bP\d+\b")
+
+# Triggers are word-bounded literals; the scanners below need only these
+_TRIGGER_LITERALS = tuple(phrase.replace(r"\b", "") for phrase in TRIGGER_PHRASES)
+
+
+def _trigger_automaton():
+    """Aho-Corasick automaton over the trigger literals, valued by length"""
+    automaton = ahocorasick.Automaton()
+    for literal in _TRIGGER_LITERALS:
+        automaton.add_word(literal, len(literal))
+    automaton.make_automaton()
+    return automaton
+
+
+# Triggers are word-bounded literals: one automaton pass finds them all
+_TRIGGER_AC = _trigger_automaton() if ahocorasick is not None else None
+
+# Cheap substring pre-check: every trigger literal contains one of these,
+# so a sentence without any cannot match (keep in step with the triggers)
+_FAST_TOKENS = (
+    "also", "oh", "by the way", "reminds", "speaking", "should", "explore",
+    "might", "note", "tangentially", "while", "idea:", "thought:",
+)
+
+# Closing block of the prompt: what the user can answer
+_ACTIONS_SUFFIX = (
+    "\nActions:\n"
+    "   - Type 'y' to capture all\n"
+    "   - Type 'n' to skip all\n"
+    "   - Type 'edit' to modify before capture\n"
+    "   - Type '1 only' to capture only item 1\n"
+    "   - Type '2 to P003' to change item 2 destination\n"
+    "   - Type 'skip' to skip all\n"
+)
+
+# A sentence: a run of text between terminators
+_SENT_RE = re.compile(r"[^.!?]+")
+
+
+def _is_word_char(text: str, i: int) -> bool:
+    """Whether text[i] is a regex word character (out of range is not)"""
+    if 0 <= i < len(text):
+        ch = text[i]
+        return ch.isalnum() or ch == "_"
+    return False
+
+
+def _has_trigger(lower: str) -> bool:
+    """Whether the (lowercased) sentence contains any trigger phrase"""
+    if _TRIGGER_AC is None:
+        return TRIGGER_RE.search(lower) is not None
+    
+    for end, length in _TRIGGER_AC.iter(lower):
+        start = end - length + 1
+        # Same word-boundary test as \b on both sides of the literal
+        if (_is_word_char(lower, start - 1) != _is_word_char(lower, start)
+                and _is_word_char(lower, end) != _is_word_char(lower, end + 1)):
+            return True
+    return False
+
+
+# Inputs at least this long are scanned whole by the compiled trigger DFA
+# (when numba is installed) instead of sentence by sentence
+SCAN_MIN_CHARS = 64 * 1024
 
-def detect_asides(text: str) -> List[Tuple[str, str]]:
+
+@lru_cache(maxsize=None)
+def _trigger_scanner():
+    """The aside_scan module and its trigger tables, or None without numba.
+
+    Imported on first use, so short inputs never pay for loading numba.
+    """
+    try:
+        import aside_scan
+    except ImportError:
+        return None
+
+    return aside_scan, aside_scan.build_tables(_TRIGGER_LITERALS)
+
+
+def _trigger_ends(text: str):
+    """Sorted positions where a trigger ends in text, or None if unavailable.
+
+    Only ASCII text is scanned: there the byte-level word test gives the
+    same boundaries as the regex.
+    """
+    scanner = _trigger_scanner()
+    if scanner is None or not text.isascii():
+        return None
+
+    aside_scan, tables = scanner
+    return aside_scan.trigger_ends(text.lower(), tables)
+
+
+# Texts up to this long are memoized; longer ones (whole transcripts) are
+# rarely seen twice and would pin megabytes each in the cache
+CACHE_MAX_CHARS = 4096
+
+
+def detect_asides(text: str) -> Tuple[Tuple[str, str], ...]:
+    """Detect potential asides in text (short texts are memoized: the result is a shared tuple)"""
+    if len(text) <= CACHE_MAX_CHARS:
+        return _detect_asides_cached(text)
+    return _detect_asides(text)
+
+
+def _detect_asides(text: str) -> Tuple[Tuple[str, str], ...]:
     """Detect potential asides in text"""
+    # Long inputs: find every trigger in one pass, then look them up per sentence
+    trigger_ends = _trigger_ends(text) if len(text) >= SCAN_MIN_CHARS else None
+
     asides = []
-    sentences = re.split(r'[.!?]+', text)
-    
-    for sentence in sentences:
-        sentence = sentence.strip()
+    for match in _SENT_RE.finditer(text):
+        sentence = match.group().strip()
         if not sentence:
             continue
+        lower = sentence.lower()
+        
+        # Check for trigger phrases (one trigger per sentence); most
+        # sentences hold none of the fast tokens and stop here
+        if trigger_ends is None:
+            has_trigger = any(t in lower for t in _FAST_TOKENS) and _has_trigger(lower)
+        else:
+            i = bisect_left(trigger_ends, match.start())
+            has_trigger = i < len(trigger_ends) and trigger_ends[i] < match.end()
+        if not has_trigger:
+            continue
         
         # Check for ignore patterns
-        if any(re.search(pattern, sentence, re.IGNORECASE) for pattern in IGNORE_PATTERNS):
+        if IGNORE_RE.search(lower):
             continue
         
-        # Check for trigger phrases
-        for trigger in TRIGGER_PHRASES:
-            if re.search(trigger, sentence, re.IGNORECASE):
-                # Infer type
-                aside_type = infer_aside_type(sentence)
-                asides.append((sentence, aside_type))
-                break  # One trigger per sentence
+        # Infer type
+        aside_type = infer_aside_type(sentence, lower)
+        asides.append((sentence, aside_type))
     
-    return asides
+    return tuple(asides)
+
 
+_detect_asides_cached = lru_cache(maxsize=1024)(_detect_asides)
 
-def infer_aside_type(sentence: str) -> str:
-    """Infer aside type (defer vs later)"""
+
+def infer_aside_type(sentence: str, lower: Optional[str] = None) -> str:
+    """Infer aside type (defer vs later); lower is sentence.lower(), if at hand"""
     # Check for project context
-    if re.search(r'\bP\d+\b', sentence):
+    if PROJECT_RE.search(sentence):
         return "defer (project)"
     
     # Check for immediate action words
-    immediate = [
-        r"\bneed to\b",
-        r"\bmust\b",
-        r"\bhave to\b",
-        r"\bstart\b",
-        r"\bbegin\b",
-    ]
-    
-    if any(re.search(pattern, sentence, re.IGNORECASE) for pattern in immediate):
+    if IMMEDIATE_RE.search(sentence.lower() if lower is None else lower):
         return "defer (project)"
     
     # Default: later (standalone idea)
     return "later (standalone)"
 
 
-def format_aside_prompt(asides: List[Tuple[str, str]]) -> str:
+def format_aside_prompt(asides: Sequence[Tuple[str, str]]) -> str:
     """Format asides for end-of-turn prompt"""
     if not asides:
         return ""
     
-    prompt = "\n📋 Detected Potential Asides:\n"
+    parts = ["\n📋 Detected Potential Asides:\n"]
     
     for i, (sentence, aside_type) in enumerate(asides, 1):
-        prompt += f"{i}. \"{sentence}\"\n"
-        prompt += f"   → Type: {aside_type}\n"
+        parts.append(f"{i}. \"{sentence}\"\n")
+        parts.append(f"   → Type: {aside_type}\n")
     
-    prompt += "\nActions:\n"
-    prompt += "   - Type 'y' to capture all\n"
-    prompt += "   - Type 'n' to skip all\n"
-    prompt += "   - Type 'edit' to modify before capture\n"
-    prompt += "   - Type '1 only' to capture only item 1\n"
-    prompt += "   - Type '2 to P003' to change item 2 destination\n"
-    prompt += "   - Type 'skip' to skip all\n"
+    parts.append(_ACTIONS_SUFFIX)
     
-    return prompt
+    return "".join(parts)
+
+
+def read_text_file(path: str) -> str:
+    """Read a transcript file, decoding from a memory map.
+
+    The decoded str is still a full copy of the file; the map only saves
+    reading it into an intermediate bytes object first.
+    """
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return str(mm, "utf-8")
+        except ValueError:
+            # Empty file: nothing to map
+            return ""
 
 
 def main():
     """Main entry point"""
-    if len(sys.argv) < 2:
-        print("❌ Usage: heuristic_asides.py [text]")
+    args = sys.argv[1:]
+    if (not args and sys.stdin.isatty()) or (args[:1] == ["--file"] and len(args) != 2):
+        print("❌ Usage: heuristic_asides.py [text | --file PATH | -]  (no argument: read stdin)")
         return
     
-    text = " ".join(sys.argv[1:])
+    if not args or args == ["-"]:
+        text = sys.stdin.read()
+    elif args[0] == "--file":
+        text = read_text_file(args[1])
+    else:
+        text = " ".join(args)
     asides = detect_asides(text)
     
     if asides:
@@ -0,0 +1,68 @@
+"""
+Shared fixtures for the gtd-tooling tests
+Puts scripts/ on sys.path and builds a throwaway workspace per test
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import gtd_commands  # noqa: E402
+import gtd_scan  # noqa: E402
+
+PROJECT_README = """---
+id: P001
+title: Alpha
+status: active
+---
+
+# Alpha
+
+## Tasks
+"""
+
+
+def write_task(path, task_id, title, status="next"):
+    """Write a minimal task file and return its path"""
+    path.write_text(f"---\nid: {task_id}\ntitle: {title}\nstatus: {status}\n---\n\n# {title}\n")
+    return path
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """An empty git workspace with one active project, P001-alpha.
+
+    gtd_commands reads its paths from HOME at import time, so they are
+    patched here; the scan caches start empty for every test.
+    """
+    root = tmp_path / "workspace"
+    project = root / "projects" / "P001-alpha"
+    (project / "tasks").mkdir(parents=True)
+    (project / "README.md").write_text(PROJECT_README)
+    (root / "memory").mkdir()
+
+    cache_dir = tmp_path / "cache" / "gtd"
+    monkeypatch.setattr(gtd_commands, "WORKSPACE", root)
+    monkeypatch.setattr(gtd_commands, "ACTIVE_FILE", root / ".active")
+    monkeypatch.setattr(gtd_commands, "PROJECTS_DIR", root / "projects")
+    monkeypatch.setattr(gtd_commands, "MEMORY_DIR", root / "memory")
+    monkeypatch.setattr(gtd_commands, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(gtd_commands, "SCAN_CACHE_FILE", cache_dir / "scan_cache.json")
+    monkeypatch.setattr(gtd_scan, "_DIR_CACHE", {})
+    monkeypatch.setattr(gtd_scan, "_TASK_CACHE", {})
+
+    for var in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(var, "GTD Tests")
+    for var in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(var, "gtd-tests@example.com")
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "."], cwd=root, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", "init"], cwd=root, check=True)
+
+    gtd_commands.set_active_project("P001")
+    return root
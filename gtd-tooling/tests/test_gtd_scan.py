@@ -0,0 +1,222 @@
+"""
+Tests for the task scanner (gtd_scan.py) and the gtd_commands entry
+points built on it: frontmatter parsing, the scan caches and task IDs
+"""
+
+import json
+import os
+import re
+import subprocess
+
+import pytest
+
+import gtd_commands
+import gtd_scan
+from conftest import write_task
+
+
+def run(monkeypatch, capsys, *args):
+    """Run gtd_commands.py with args; return its exit code and stdout"""
+    monkeypatch.setattr("sys.argv", ["gtd_commands.py", *args])
+    with pytest.raises(SystemExit) as exit_info:
+        gtd_commands.main()
+    return exit_info.value.code, capsys.readouterr().out
+
+
+def status_counts(output):
+    """{status: count} from the dashboard's 'Tasks by Status' section"""
+    section = output.split("Tasks by Status:")[1].split("\n\n")[0]
+    return {status: int(count) for status, count in re.findall(r"(\w+): (\d+)", section)}
+
+
+def bump_mtime(path):
+    """Move a file's mtime forward, as an edit a moment later would"""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+# parse_frontmatter / read_frontmatter
+
+def test_parse_frontmatter_fields():
+    """Fields come from the frontmatter block, first occurrence wins"""
+    content = "---\nid: K001\ntitle: Write docs\nstatus: next\nstatus: done\n---\n"
+    assert gtd_scan.parse_frontmatter(content) == {"id": "K001", "title": "Write docs", "status": "next"}
+
+
+def test_parse_frontmatter_ignores_body():
+    """Fields after the closing '---' line are not read"""
+    content = "---\nid: K001\n---\n\nstatus: done\n"
+    assert gtd_scan.parse_frontmatter(content) == {"id": "K001"}
+
+
+def test_parse_frontmatter_dashes_inside_a_line():
+    """'---' inside a value or a longer rule doesn't close the block"""
+    content = "---\nid: K001\ntitle: Before --- after\n-----\nstatus: next\n---\nstatus: done\n"
+    assert gtd_scan.parse_frontmatter(content) == {
+        "id": "K001", "title": "Before --- after", "status": "next",
+    }
+
+
+def test_parse_frontmatter_without_block():
+    """A file without a frontmatter block is scanned whole"""
+    assert gtd_scan.parse_frontmatter("# Notes\nstatus: waiting\n") == {"status": "waiting"}
+
+
+def test_read_frontmatter_stops_after_block(tmp_path):
+    """Only the frontmatter block is read, even with '---' in the title"""
+    path = tmp_path / "K001-x.md"
+    path.write_text("---\ntitle: a --- b\n---\n" + "body\n" * 1000)
+    assert gtd_scan.read_frontmatter(path) == "---\ntitle: a --- b\n---"
+
+
+def test_read_frontmatter_longer_than_cap(tmp_path):
+    """A block that doesn't close within cap is read whole"""
+    path = tmp_path / "K001-x.md"
+    content = "---\nid: K001\n" + "notes: x\n" * 50 + "status: next\n---\nbody\n"
+    path.write_text(content)
+    assert gtd_scan.read_frontmatter(path, cap=64) == content
+    assert gtd_scan.parse_frontmatter(gtd_scan.read_frontmatter(path, cap=64))["status"] == "next"
+
+
+# scan_tasks and the dashboard
+
+def test_dashboard_sees_create_edit_and_delete(workspace, monkeypatch, capsys):
+    """Repeat runs in one process pick up new, edited and deleted tasks"""
+    tasks_dir = workspace / "projects" / "P001-alpha" / "tasks"
+    first = write_task(tasks_dir / "K001-first.md", "K001", "First")
+    write_task(tasks_dir / "K002-second.md", "K002", "Second", status="waiting")
+
+    code, output = run(monkeypatch, capsys, "gtd")
+    assert code == 0
+    assert status_counts(output) == {"inbox": 0, "next": 1, "waiting": 1, "later": 0, "done": 0}
+
+    # Edited in place: same directory listing, new mtime
+    first.write_text(first.read_text().replace("status: next", "status: done"))
+    bump_mtime(first)
+    _, output = run(monkeypatch, capsys, "gtd")
+    assert status_counts(output)["next"] == 0
+    assert status_counts(output)["done"] == 1
+
+    (tasks_dir / "K002-second.md").unlink()
+    write_task(tasks_dir / "K003-third.md", "K003", "Third", status="later")
+    _, output = run(monkeypatch, capsys, "gtd")
+    assert status_counts(output) == {"inbox": 0, "next": 0, "waiting": 0, "later": 1, "done": 1}
+
+
+def test_scan_cache_file(workspace, monkeypatch):
+    """The JSON cache lives outside the workspace and tracks deletions"""
+    tasks_dir = workspace / "projects" / "P001-alpha" / "tasks"
+    write_task(tasks_dir / "K001-first.md", "K001", "First")
+    gone = write_task(tasks_dir / "K002-second.md", "K002", "Second")
+
+    cache_file = gtd_commands.SCAN_CACHE_FILE
+    gtd_scan.scan_tasks(gtd_commands.PROJECTS_DIR, cache_file=cache_file)
+    assert not str(cache_file).startswith(str(workspace))
+    assert sorted(json.loads(cache_file.read_text())) == sorted(
+        str(path) for path in tasks_dir.iterdir()
+    )
+
+    gone.unlink()
+    gtd_scan.scan_tasks(gtd_commands.PROJECTS_DIR, cache_file=cache_file)
+    assert list(json.loads(cache_file.read_text())) == [str(tasks_dir / "K001-first.md")]
+    assert list(gtd_scan._TASK_CACHE) == [str(tasks_dir / "K001-first.md")]
+
+
+def test_scan_cache_file_skips_unchanged(workspace, monkeypatch):
+    """A new process reads only the task files whose mtime changed"""
+    tasks_dir = workspace / "projects" / "P001-alpha" / "tasks"
+    write_task(tasks_dir / "K001-first.md", "K001", "First")
+    edited = write_task(tasks_dir / "K002-second.md", "K002", "Second")
+    cache_file = gtd_commands.SCAN_CACHE_FILE
+    gtd_scan.scan_tasks(gtd_commands.PROJECTS_DIR, cache_file=cache_file)
+
+    edited.write_text(edited.read_text().replace("status: next", "status: waiting"))
+    bump_mtime(edited)
+
+    # As if in a new process: only the cache file is left
+    monkeypatch.setattr(gtd_scan, "_DIR_CACHE", {})
+    monkeypatch.setattr(gtd_scan, "_TASK_CACHE", {})
+    read = []
+    real_read = gtd_scan.read_frontmatter
+    monkeypatch.setattr(gtd_scan, "read_frontmatter", lambda path: read.append(path) or real_read(path))
+
+    tasks = gtd_scan.scan_tasks(gtd_commands.PROJECTS_DIR, cache_file=cache_file)
+    assert read == [str(edited)]
+    assert {task.id: task.status for task in tasks} == {"K001": "next", "K002": "waiting"}
+
+
+@pytest.mark.parametrize("saved", [
+    "not json",
+    "[]",
+    '{"a": 1}',
+    '{"a": [1, 2]}',
+    '{"a": [1, 2, 3, 4, 5, 6]}',
+])
+def test_scan_cache_file_bad_shape(workspace, saved):
+    """A cache file that can't be read as one is ignored and rewritten"""
+    tasks_dir = workspace / "projects" / "P001-alpha" / "tasks"
+    write_task(tasks_dir / "K001-first.md", "K001", "First")
+    cache_file = gtd_commands.SCAN_CACHE_FILE
+    cache_file.parent.mkdir(parents=True)
+    cache_file.write_text(saved)
+
+    tasks = gtd_scan.scan_tasks(gtd_commands.PROJECTS_DIR, cache_file=cache_file)
+    assert [task.id for task in tasks] == ["K001"]
+    assert list(json.loads(cache_file.read_text())) == [str(tasks_dir / "K001-first.md")]
+
+
+# Task IDs
+
+def test_add_task_numbers_and_commits(workspace, monkeypatch, capsys):
+    """':add task' picks the next ID, commits the task and links it"""
+    write_task(workspace / "projects" / "P001-alpha" / "tasks" / "K004-old.md", "K004", "Old")
+
+    code, _ = run(monkeypatch, capsys, "add", "Write docs")
+    assert code == 0
+    code, _ = run(monkeypatch, capsys, "add", "Fix bug")
+    assert code == 0
+
+    tasks_dir = workspace / "projects" / "P001-alpha" / "tasks"
+    assert (tasks_dir / "K005-write-docs.md").exists()
+    assert (tasks_dir / "K006-fix-bug.md").exists()
+    assert "[[tasks/K006|K006]]: Fix bug" in (workspace / "projects" / "P001-alpha" / "README.md").read_text()
+
+    log = subprocess.run(
+        ["git", "log", "--format=%s"], cwd=workspace, check=True, capture_output=True, text=True
+    ).stdout
+    assert log.splitlines()[:2] == ["Add task: K006 - Fix bug", "Add task: K005 - Write docs"]
+
+    # The counter is machine-local: nothing new to commit in the workspace
+    assert not list(workspace.glob(".gtd_counter_*"))
+    assert (gtd_commands.CACHE_DIR / "counter_K").read_text() == "6"
+
+
+def test_next_id_skips_ids_on_disk(workspace):
+    """A task made behind the counter's back is not handed out again"""
+    tasks_dir = workspace / "projects" / "P001-alpha" / "tasks"
+    assert gtd_commands.create_task("First") == "K001"
+    write_task(tasks_dir / "K002-by-hand.md", "K002", "By hand")
+
+    assert gtd_commands.create_task("Second") == "K003"
+
+
+def test_next_id_skips_ids_outside_tasks(workspace):
+    """Task files archived or moved out of tasks/ keep their numbers"""
+    archive = workspace / "projects" / "P001-alpha" / "archive"
+    archive.mkdir()
+    write_task(archive / "K007-archived.md", "K007", "Archived")
+    assert gtd_commands.create_task("First") == "K008"
+
+    (gtd_commands.CACHE_DIR / "counter_K").write_text("1")
+    write_task(archive / "K002-moved.md", "K002", "Moved")
+    assert gtd_commands.create_task("Second") == "K003"
+
+
+def test_failed_create_keeps_id(workspace):
+    """An ID reserved by a create that fails is handed out next time"""
+    with pytest.raises(RuntimeError):
+        with gtd_commands.reserve_id("K") as task_id:
+            assert task_id == "K001"
+            raise RuntimeError("disk full")
+
+    assert gtd_commands.create_task("First") == "K001"
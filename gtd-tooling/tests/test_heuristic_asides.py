@@ -0,0 +1,93 @@
+"""
+Regression tests for heuristic_asides.detect_asides: every trigger
+matcher (regex, Aho-Corasick automaton, compiled DFA) gives the same asides
+"""
+
+import pytest
+
+import heuristic_asides
+
+LATER = "later (standalone)"
+DEFER = "defer (project)"
+
+# (text, expected asides), as the original regex matcher finds them
+SAMPLES = [
+    (
+        "We fixed the bug. Also we should look into caching for P003! Oh and the deploy is done.",
+        (("Also we should look into caching for P003", DEFER), ("Oh and the deploy is done", LATER)),
+    ),
+    (
+        "By the way, we need to refactor the parser. Speaking of which we were debugging. "
+        "Also but however that is fine.",
+        (("By the way, we need to refactor the parser", DEFER),),
+    ),
+    (
+        "Idea: build a dashboard? Thought: might want to add tests. Nothing here. "
+        "While we're at it, consider renaming.",
+        (("Thought: might want to add tests", LATER), ("While we're at it, consider renaming", LATER)),
+    ),
+    (
+        "ALSO uppercase test. tangentially related, we must start soon. On a related note the cache is slow.",
+        (
+            ("ALSO uppercase test", LATER),
+            ("tangentially related, we must start soon", DEFER),
+            ("On a related note the cache is slow", LATER),
+        ),
+    ),
+    (
+        # Word boundaries: no trigger inside shoe, Ohm or also_this
+        "The shoe fits. Ohm's law holds. also_this is code. Cold idea:x here. 2also3 no.",
+        (("Cold idea:x here", LATER),),
+    ),
+    (
+        # Non-ASCII text: the DFA hands it to the per-sentence matcher
+        "Paléo café, oh là là. Déjà vu.",
+        (("Paléo café, oh là là", LATER),),
+    ),
+    ("plain sentence without anything. another one", ()),
+]
+
+
+@pytest.fixture(params=["regex", "ahocorasick", "dfa"])
+def matcher(request, monkeypatch):
+    """Force detect_asides onto one trigger matcher"""
+    if request.param == "regex":
+        monkeypatch.setattr(heuristic_asides, "_TRIGGER_AC", None)
+        monkeypatch.setattr(heuristic_asides, "SCAN_MIN_CHARS", float("inf"))
+    elif request.param == "ahocorasick":
+        if heuristic_asides._TRIGGER_AC is None:
+            pytest.skip("pyahocorasick not installed")
+        monkeypatch.setattr(heuristic_asides, "SCAN_MIN_CHARS", float("inf"))
+    else:
+        if heuristic_asides._trigger_scanner() is None:
+            pytest.skip("numba not installed")
+        monkeypatch.setattr(heuristic_asides, "SCAN_MIN_CHARS", 0)
+    return request.param
+
+
+@pytest.mark.parametrize("text, expected", SAMPLES)
+def test_samples(matcher, text, expected):
+    """Each matcher finds the same asides in the fixed samples"""
+    # Uncached, so every matcher really runs
+    assert heuristic_asides._detect_asides(text) == expected
+
+
+def test_long_input_takes_dfa_path(monkeypatch):
+    """A transcript past SCAN_MIN_CHARS is scanned by the DFA, with the same result"""
+    if heuristic_asides._trigger_scanner() is None:
+        pytest.skip("numba not installed")
+
+    # The DFA only takes ASCII text
+    chunk = " ".join(text for text, _ in SAMPLES if text.isascii()) + " "
+    text = chunk * (heuristic_asides.SCAN_MIN_CHARS // len(chunk) + 1)
+    assert len(text) >= heuristic_asides.SCAN_MIN_CHARS
+    assert heuristic_asides._trigger_ends(text) is not None
+
+    expected = tuple(aside for text, asides in SAMPLES if text.isascii() for aside in asides)
+    found = heuristic_asides.detect_asides(text)
+    assert len(found) == len(expected) * (len(text) // len(chunk))
+    assert found[:len(expected)] == expected
+
+    monkeypatch.setattr(heuristic_asides, "_TRIGGER_AC", None)
+    monkeypatch.setattr(heuristic_asides, "SCAN_MIN_CHARS", float("inf"))
+    assert heuristic_asides.detect_asides(text) == found
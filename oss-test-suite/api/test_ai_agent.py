@@ -1,8 +1,10 @@
+import asyncio
 import os
 import pytest
 from langchain.agents import initialize_agent, Tool
 from langchain.agents import AgentType
 from langchain.chat_models import ChatOpenAI
+from langchain.schema import HumanMessage
 
 # Configuration for Local VibeProxy
 BASE_URL = "http://localhost:8318/v1"
@@ -17,15 +19,34 @@ class APITester:
             model_name=MODEL,
             temperature=0
         )
-        
+        # One loop for the tester's lifetime: the async client's pooled
+        # connections are tied to the loop they were opened on
+        self.loop = asyncio.new_event_loop()
+
+    async def plan_tests(self, endpoint_descs: list[str]):
+        """Generates test plans for several endpoint descriptions concurrently."""
+        messages = [
+            [HumanMessage(content=f"Plan a comprehensive test for this API endpoint: {desc}. Include edge cases and validation steps.")]
+            for desc in endpoint_descs
+        ]
+        replies = await self.llm.abatch(messages)
+        return [reply.content for reply in replies]
+
     def plan_test(self, endpoint_desc: str):
         """Generates a test plan based on endpoint description."""
-        prompt = f"Plan a comprehensive test for this API endpoint: {endpoint_desc}. Include edge cases and validation steps."
-        return self.llm.predict(prompt)
+        return self.loop.run_until_complete(self.plan_tests([endpoint_desc]))[0]
+
+    def close(self):
+        """Closes the event loop used by plan_test."""
+        self.loop.close()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def tester():
-    return APITester()
+    # One client and connection pool for the whole run, so keep-alive
+    # connections to the proxy are reused between tests
+    tester = APITester()
+    yield tester
+    tester.close()
 
 def test_ai_generated_plan(tester):
     # Example: Testing the Mission Control health endpoint
@@ -4,9 +4,25 @@ Generate test plans from natural language specs using AI.
 This script reads spec files and generates pytest-compatible test cases.
 """
 
+import asyncio
+import hashlib
+import logging
 import os
+import queue
+import re
 import sys
-from openai import OpenAI
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from typing import TextIO
+import httpx
+from openai import AsyncOpenAI
+
+# HTTP/2 for httpx (pip install 'httpx[http2]'); optional
+try:
+    import h2
+except ImportError:
+    h2 = None
 
 # Configuration
 BASE_URL = os.getenv("VIBEPROXY_BASE_URL", "http://localhost:8318/v1")
@@ -14,61 +30,279 @@ API_KEY = os.getenv("VIBEPROXY_API_KEY", "local-token")
 MODEL = os.getenv("VIBEPROXY_MODEL", "zai/glm-4.7")
 SPECS_DIR = "specs"
 OUTPUT_DIR = "output/test-plans"
+CACHE_DIR = "output/.cache"
 
-client = OpenAI(base_url=BASE_URL, api_key=API_KEY)
+def env_count(name: str, default: int) -> int:
+    """An environment variable as an int of at least 1, or default if unset or invalid."""
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        return default
 
-def generate_test_plan(spec_text: str) -> str:
-    """Generate a test plan from a natural language spec."""
-    prompt = f"""
-You are an expert QA engineer. Given this specification, generate a comprehensive test plan:
+# Max requests in flight at once
+CONCURRENCY = env_count("VIBEPROXY_CONCURRENCY", 16)
+# Specs sent together in one request (1 = one request per spec)
+BATCH_SIZE = env_count("VIBEPROXY_BATCH_SIZE", 4)
+# Threads reading and writing files while requests are in flight
+IO_WORKERS = 8
 
-Specification:
-{spec_text}
+# Bump when the prompts change, so cached plans are generated again
+PROMPT_VERSION = "2"
 
-Generate the test plan in the following format:
+# Sent unchanged as the first message of every request, so a backend that
+# caches prompt prefixes can reuse it; only the user message varies
+SYSTEM_PROMPT = """\
+You are an expert QA engineer. Given a specification, generate a comprehensive test plan in the following format:
 1. Test Case ID
 2. Description
 3. Preconditions
 4. Test Steps
 5. Expected Results
 6. Priority (High/Medium/Low)
+
+When given several specifications as "### Spec N" sections, generate a test plan for each, in order. Start the plan for spec N with a line containing only "### Plan N".\
 """
 
-    response = client.chat.completions.create(
+# "### Plan N" header lines that delimit the plans in a batched response
+_RE_PLAN_HEADER = re.compile(r"^### Plan (\d+)[ \t]*$", re.MULTILINE)
+
+# One connection pool for every request; with HTTP/2 the concurrent
+# requests are multiplexed over a few connections instead of one each
+http_client = httpx.AsyncClient(
+    http2=h2 is not None,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+)
+log = logging.getLogger(__name__)
+
+client = AsyncOpenAI(base_url=BASE_URL, api_key=API_KEY, http_client=http_client)
+io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS)
+
+async def run_io(func, *args):
+    """Run a blocking file operation on io_pool, off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(io_pool, func, *args)
+
+async def complete(prompt: str, out: TextIO | None = None) -> str:
+    """Send one prompt to the model (after SYSTEM_PROMPT) and return its reply.
+
+    The reply is streamed; with out, each piece is also written there (on
+    io_pool) as soon as it arrives.
+    """
+    stream = await client.chat.completions.create(
         model=MODEL,
         messages=[
-            {"role": "system", "content": "You are an expert QA engineer."},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
-        temperature=0.3
+        temperature=0.3,
+        stream=True
     )
 
-    return response.choices[0].message.content
+    pieces = []
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            pieces.append(delta)
+            if out is not None:
+                await run_io(out.write, delta)
 
-def main():
-    """Main function to generate test plans from specs."""
+    return "".join(pieces)
+
+async def generate_test_plan_async(spec_text: str, out: TextIO | None = None) -> str:
+    """Generate a test plan from a natural language spec (streamed to out, if given)."""
+    return await complete(spec_text, out)
+
+async def generate_test_plans_async(spec_texts: list[str], sem: asyncio.Semaphore) -> list[str]:
+    """Generate test plans for several specs with a single request.
+
+    Falls back to one request per spec if the reply doesn't hold exactly
+    one "### Plan N" section per spec. Every request, the fallback ones
+    included, holds a slot of sem while it is in flight.
+    """
+    async def generate_one(spec_text: str) -> str:
+        async with sem:
+            return await generate_test_plan_async(spec_text)
+
+    if len(spec_texts) == 1:
+        return [await generate_one(spec_texts[0])]
+
+    specs = "\n\n".join(
+        f"### Spec {i}\n{spec_text}" for i, spec_text in enumerate(spec_texts, 1)
+    )
+    async with sem:
+        reply = await complete(specs)
+
+    # ["", "1", plan 1, "2", plan 2, ...]
+    parts = _RE_PLAN_HEADER.split(reply)
+    numbers = [int(n) for n in parts[1::2]]
+    if numbers != list(range(1, len(spec_texts) + 1)):
+        return list(await asyncio.gather(*map(generate_one, spec_texts)))
+
+    return [plan.strip() for plan in parts[2::2]]
+
+def cache_path(spec_text: str) -> str:
+    """Where the plan for this spec, model and prompt version is cached."""
+    # NUL-separated, so no two (model, version, spec) triples share a key
+    key = hashlib.blake2b("\0".join((MODEL, PROMPT_VERSION, spec_text)).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.md")
+
+def read_cached_plan(spec_text: str) -> str | None:
+    """The cached plan for a spec, or None if it was never generated."""
+    try:
+        with open(cache_path(spec_text), "r") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def open_temp(directory: str) -> TextIO:
+    """Open a new, uniquely named temporary file in directory for writing.
+
+    Every writer gets its own file, so two specs with the same text (and
+    so the same cache key) can be saved at once without clashing.
+    """
+    f = tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False)
+    # NamedTemporaryFile is owner-only; plans and cached plans are not secret
+    os.chmod(f.name, 0o644)
+    return f
+
+def write_cached_plan(spec_text: str, plan: str) -> None:
+    """Cache a generated plan (atomically, so a killed run leaves no partial file).
+
+    An empty plan is not cached, so the spec is tried again next run.
+    """
+    if not plan.strip():
+        return
+
+    with open_temp(CACHE_DIR) as f:
+        f.write(plan)
+    os.replace(f.name, cache_path(spec_text))
+
+def load_spec(spec_file: str) -> tuple[str, str | None]:
+    """Read a spec file and look up its cached plan (None if not cached)."""
+    with open(os.path.join(SPECS_DIR, spec_file), "r") as f:
+        spec_text = f.read()
+
+    return spec_text, read_cached_plan(spec_text)
+
+def plan_path(spec_file: str) -> str:
+    """The output file for a spec file's test plan."""
+    return os.path.join(OUTPUT_DIR, spec_file.replace(".txt", "_plan.md"))
+
+def write_plan_header(f: TextIO, spec_file: str, spec_text: str) -> None:
+    """Write everything in a test plan file that comes before the plan."""
+    f.write(f"# Test Plan: {spec_file}\n\n")
+    f.write(f"## Specification\n\n```\n{spec_text}\n```\n\n")
+    f.write("## AI-Generated Test Plan\n\n")
+
+def save_test_plan(spec_file: str, spec_text: str, plan: str) -> None:
+    """Write the test plan for a spec file to OUTPUT_DIR."""
+    output_path = plan_path(spec_file)
+
+    with open(output_path, "w") as f:
+        write_plan_header(f, spec_file, spec_text)
+        f.write(f"{plan}\n")
+
+    log.info(f"✅ Saved to {output_path}")
+
+def discard(f: TextIO) -> None:
+    """Close and delete a partly written file."""
+    f.close()
+    os.remove(f.name)
+
+async def process_one(spec_file: str, spec_text: str, sem: asyncio.Semaphore) -> None:
+    """Generate and cache the test plan for one spec, streaming it to its file.
+
+    The plan is streamed into a temporary file that replaces the output
+    file only once the whole reply is in, so a failed request leaves the
+    previous plan (if any) in place.
+    """
+    output_path = plan_path(spec_file)
+
+    async with sem:
+        log.info(f"Generating test plan for {spec_file}...")
+        f = await run_io(open_temp, OUTPUT_DIR)
+        try:
+            await run_io(write_plan_header, f, spec_file, spec_text)
+            plan = await generate_test_plan_async(spec_text, out=f)
+            await run_io(f.write, "\n")
+        except BaseException:
+            await run_io(discard, f)
+            raise
+        await run_io(f.close)
+
+    await run_io(os.replace, f.name, output_path)
+    await run_io(write_cached_plan, spec_text, plan)
+    log.info(f"✅ Saved to {output_path}")
+
+async def process(specs: list[tuple[str, str]], sem: asyncio.Semaphore) -> None:
+    """Generate, cache and save the test plans for a batch of (file, text) specs.
+
+    A batch of one is streamed straight into its file; a larger batch is
+    split into plans once the whole reply is in.
+    """
+    if len(specs) == 1:
+        return await process_one(*specs[0], sem)
+
+    spec_files = [spec_file for spec_file, _ in specs]
+    spec_texts = [spec_text for _, spec_text in specs]
+
+    log.info(f"Generating test plans for {', '.join(spec_files)}...")
+    plans = await generate_test_plans_async(spec_texts, sem)
+
+    await asyncio.gather(*[
+        run_io(write_cached_plan, spec_text, plan) for spec_text, plan in zip(spec_texts, plans)
+    ], *[
+        run_io(save_test_plan, *args) for args in zip(spec_files, spec_texts, plans)
+    ])
+
+async def main_async():
+    """Generate test plans for all specs, CONCURRENCY requests at a time.
+
+    Specs whose plan is already in CACHE_DIR are saved without a request.
+    """
     os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(CACHE_DIR, exist_ok=True)
 
     spec_files = [f for f in os.listdir(SPECS_DIR) if f.endswith(".txt")]
 
-    for spec_file in spec_files:
-        spec_path = os.path.join(SPECS_DIR, spec_file)
-        output_path = os.path.join(OUTPUT_DIR, spec_file.replace(".txt", "_plan.md"))
+    loaded = await asyncio.gather(*[run_io(load_spec, f) for f in spec_files])
+
+    pending = []
+    saves = []
+    for spec_file, (spec_text, plan) in zip(spec_files, loaded):
+        if plan is None:
+            pending.append((spec_file, spec_text))
+        else:
+            log.info(f"Using cached test plan for {spec_file}")
+            saves.append(run_io(save_test_plan, spec_file, spec_text, plan))
 
-        with open(spec_path, "r") as f:
-            spec_text = f.read()
+    batches = [pending[i:i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]
 
-        print(f"Generating test plan for {spec_file}...")
-        plan = generate_test_plan(spec_text)
+    sem = asyncio.Semaphore(CONCURRENCY)
+    try:
+        await asyncio.gather(*saves, *[process(batch, sem) for batch in batches])
+    finally:
+        await client.close()
 
-        with open(output_path, "w") as f:
-            f.write(f"# Test Plan: {spec_file}\n\n")
-            f.write(f"## Specification\n\n```\n{spec_text}\n```\n\n")
-            f.write(f"## AI-Generated Test Plan\n\n{plan}\n")
+    log.info(f"\n🎉 Generated {len(spec_files)} test plans!")
 
-        print(f"✅ Saved to {output_path}")
+def main():
+    """Main function to generate test plans from specs."""
+    # Progress lines are queued and written to stdout by a listener thread,
+    # so logging never blocks the event loop or the I/O threads. Only this
+    # script's logger is set up; httpx and openai keep the root defaults
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    log.addHandler(QueueHandler(log_queue))
+    log.setLevel(logging.INFO)
+    log.propagate = False
 
-    print(f"\n🎉 Generated {len(spec_files)} test plans!")
+    listener.start()
+    try:
+        asyncio.run(main_async())
+    finally:
+        listener.stop()
 
 if __name__ == "__main__":
     main()